@@ -1,13 +1,18 @@
 # core/market_streamer.py
 
-import json
 import datetime
+import threading
+import traceback
+from collections import deque
+import numpy as np
+import orjson
 import upstox_client
 from config.settings import ACCESS_TOKEN
 
 from strategy.scanner import MarketScanner
-from strategy.vwap_filter import VWAPCalculator
+from strategy.vwap_filter import VWAPBook
 from strategy.strategy_engine import StrategyEngine
+from strategy._njit import warm_up as warm_up_kernels
 
 from execution.execution_engine import ExecutionEngine
 from execution.order_executor import OrderExecutor
@@ -19,14 +24,27 @@ from execution.trade_logger import TradeLogger
 FEED_MODE = "full"
 
 # ---------------- LOAD UNIVERSE ----------------
-with open("data/nifty500_keys.json", "r") as f:
-    INSTRUMENT_LIST = json.load(f)
+with open("data/nifty500_keys.json", "rb") as f:
+    INSTRUMENT_LIST = orjson.loads(f.read())
+
+# stable inst_key -> row index used by the tick buffers below
+INST_IDX = {k: i for i, k in enumerate(INSTRUMENT_LIST)}
+N_INST = len(INSTRUMENT_LIST)
+
+# ---------------- TICK BUFFERS ----------------
+# one row per instrument: ltp, high, low, close, volume
+TICK_FIELDS = 5
+tick_arr = np.zeros((N_INST, TICK_FIELDS), dtype=np.float64)
+last_tick_arr = np.full((N_INST, TICK_FIELDS), np.nan, dtype=np.float64)
+dirty = np.zeros(N_INST, dtype=bool)
 
 # ---------------- CORE OBJECTS ----------------
 scanner = MarketScanner(max_len=600)
-vwap_calculators = {inst: VWAPCalculator() for inst in INSTRUMENT_LIST}
+vwap_book = VWAPBook(INSTRUMENT_LIST)  # rows follow INST_IDX
 
-strategy_engine = StrategyEngine(scanner, vwap_calculators)
+strategy_engine = StrategyEngine(scanner, vwap_book)
+# compile (or load cached) numba kernels now, not on the first bar close
+warm_up_kernels()
 
 order_executor = OrderExecutor()
 trade_monitor = TradeMonitor()
@@ -40,9 +58,56 @@ execution_engine = ExecutionEngine(
     trade_logger
 )
 
-signals_today = {}
+# one flag per instrument (INST_IDX order): already signalled today
+signals_today_mask = np.zeros(N_INST, dtype=np.uint8)
+signals_day = None
 ALLOW_NEW_TRADES = True
 
+# ---------------- MESSAGE BATCHING ----------------
+# WS frames are queued here and drained in coalesced batches.
+# maxlen only guards memory if the drain thread stalls; frames it pushes
+# out are counted in dropped_frames and reported.
+MAX_PENDING_MESSAGES = 4096
+DRAIN_BATCH = 128
+DROP_WARN_EVERY = 1000
+
+pending = deque(maxlen=MAX_PENDING_MESSAGES)
+pending_event = threading.Event()
+dropped_frames = 0
+
+
+def process_ticks(tick_arr, last_tick_arr, dirty):
+    """
+    Compare the freshly filled rows against the last tick seen per instrument.
+    Returns the row indices whose ltp/bar changed (those need a strategy pass)
+    and clears the dirty mask for the next message.
+    """
+    changed = dirty & np.any(tick_arr != last_tick_arr, axis=1)
+    last_tick_arr[changed] = tick_arr[changed]
+    dirty[:] = False
+    return np.flatnonzero(changed)
+
+
+def merge_feeds(merged, feeds):
+    """
+    Fold one message's feeds into `merged` (inst_key -> feed_info).
+    Later frames win, except that an ltp-only frame (no marketOHLC bars)
+    keeps the OHLC of the frame it replaces, so coalescing never drops a
+    bar update.
+    """
+    for inst_key, feed_info in feeds.items():
+        prev = merged.get(inst_key)
+        if prev is not None:
+            data = feed_info.get("fullFeed", {}).get("marketFF", {})
+            prev_ohlc = prev.get("fullFeed", {}).get("marketFF", {}).get("marketOHLC")
+            if prev_ohlc and not data.get("marketOHLC", {}).get("ohlc"):
+                full_feed = feed_info.get("fullFeed", {})
+                feed_info = {
+                    **feed_info,
+                    "fullFeed": {**full_feed, "marketFF": {**data, "marketOHLC": prev_ohlc}},
+                }
+        merged[inst_key] = feed_info
+
 
 # ---------------- STREAMER ----------------
 def start_market_streamer():
@@ -58,19 +123,25 @@ def start_market_streamer():
         FEED_MODE
     )
 
-    def on_message(message):
-        global ALLOW_NEW_TRADES
+    def process_feeds(feeds):
+        global ALLOW_NEW_TRADES, signals_day
 
-        feeds = message.get("feeds", {})
+        # one clock read per drained batch, shared by every instrument in it
         now = datetime.datetime.now()
-        today = now.date().isoformat()
+        today = now.date()
 
-        if today not in signals_today:
-            signals_today[today] = set()
+        if today != signals_day:
+            signals_today_mask[:] = 0
+            signals_day = today
 
         current_prices = {}
 
+        # ---- Fill Tick Buffers (single pass over the feed) ----
         for inst_key, feed_info in feeds.items():
+            idx = INST_IDX.get(inst_key)
+            if idx is None:
+                continue
+
             data = feed_info.get("fullFeed", {}).get("marketFF", {})
 
             try:
@@ -93,25 +164,86 @@ def start_market_streamer():
             except Exception:
                 continue
 
-            # ---- Update Market State ----
-            scanner.update(inst_key, ltp, high, low, close, volume)
+            # written only once every field parsed, so a bad bar never
+            # leaves a half-updated row behind for the next comparison
+            tick_arr[idx] = (ltp, high, low, close, volume)
+            dirty[idx] = True
 
-            # ---- Strategy Evaluation ----
-            decision = strategy_engine.evaluate(inst_key, ltp)
+        changed = process_ticks(tick_arr, last_tick_arr, dirty)
 
-            if not decision:
-                continue
+        # ---- VWAP for the whole batch (vectorised) ----
+        vwap_book.update_many(changed, tick_arr[changed, 0], tick_arr[changed, 4])
 
+        # ---- Update market state for every changed instrument ----
+        changed_idx = changed.tolist()
+        changed_keys = [INSTRUMENT_LIST[idx] for idx in changed_idx]
+        for idx, inst_key in zip(changed_idx, changed_keys):
+            ltp, high, low, close, volume = tick_arr[idx].tolist()
+            scanner.update(inst_key, ltp, high, low, close, volume, now=now)
+
+        # ---- Strategy evaluation for the whole batch ----
+        # each instrument's evaluation reads only its own scanner / VWAP /
+        # MTF state, so running it after all updates is equivalent
+        ltps = tick_arr[changed, 0]
+        for pos, decision in strategy_engine.evaluate_batch(changed_keys, ltps):
             if decision.state.startswith("EXECUTE"):
-                if inst_key in signals_today[today]:
+                idx = changed_idx[pos]
+                if signals_today_mask[idx]:
                     continue
 
-                signals_today[today].add(inst_key)
-                execution_engine.handle_entry(inst_key, decision, ltp)
+                signals_today_mask[idx] = 1
+                execution_engine.handle_entry(changed_keys[pos], decision, float(ltps[pos]))
 
         # ---- Exit Handling ----
         execution_engine.handle_exits(current_prices, now)
 
+    def drain():
+        """
+        Pop up to DRAIN_BATCH queued messages and merge their feeds.
+        Ticks are last-value-wins per inst_key (see merge_feeds), and the
+        pipeline runs once for the whole batch.
+        """
+        merged = {}
+        for _ in range(DRAIN_BATCH):
+            try:
+                message = pending.popleft()
+            except IndexError:
+                break
+            # a malformed frame only costs itself, not the rest of the batch
+            try:
+                merge_feeds(merged, message.get("feeds", {}))
+            except Exception:
+                print("[MarketStreamer] Skipping malformed message:")
+                traceback.print_exc()
+
+        if merged:
+            process_feeds(merged)
+
+    def drain_loop():
+        while True:
+            pending_event.wait()
+            pending_event.clear()
+            while pending:
+                try:
+                    drain()
+                except Exception:
+                    print("[MarketStreamer] Error processing batch:")
+                    traceback.print_exc()
+
+    def on_message(message):
+        global dropped_frames
+
+        # a full deque silently evicts the oldest frame on append
+        if len(pending) == MAX_PENDING_MESSAGES:
+            dropped_frames += 1
+            if dropped_frames % DROP_WARN_EVERY == 1:
+                print(f"[MarketStreamer] Backpressure: {dropped_frames} frames dropped so far")
+        pending.append(message)
+        pending_event.set()
+
+    drain_thread = threading.Thread(target=drain_loop, daemon=True)
+    drain_thread.start()
+
     streamer.on("message", on_message)
     streamer.connect()
 
@@ -37,7 +37,7 @@ class ExecutionEngine:
         exits = self.trade_monitor.check_trades(current_prices)
 
         for trade_id, reason, exit_price in exits:
-            trade = self.trade_monitor.trades.get(trade_id)
+            trade = self.trade_monitor.active_trades.get(trade_id)
             if not trade:
                 continue
 
@@ -47,7 +47,7 @@ class ExecutionEngine:
                 quantity=trade.qty,
                 entry_price=trade.entry_price,
                 exit_price=exit_price,
-                entry_time=trade.entry_time,
+                entry_time=trade.open_time,
                 exit_time=now,
                 exit_reason=reason,
                 strategy="elite_intraday_v2"
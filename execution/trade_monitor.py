@@ -1,6 +1,9 @@
 # execution/trade_monitor.py
 
 from datetime import datetime
+
+import numpy as np
+
 from execution.execution_config import (
     STOP_LOSS_PCT,
     TARGET_PCT,
@@ -49,19 +52,44 @@ class TrackedTrade:
 class TradeMonitor:
     """
     Monitors live trades and triggers exit logic.
+
+    Exit checks run over struct-of-arrays copies of the open trades
+    (entry / stop / target / side sign), rebuilt only when a trade is
+    added or removed; the TrackedTrade objects stay the public record and
+    are kept in sync when a stop moves or a trade closes.
     """
 
     def __init__(self):
         self.active_trades = {}
+        self._soa_stale = True
 
     def add_trade(self, trade_id, inst_key, side, entry_price, qty):
         self.active_trades[trade_id] = TrackedTrade(
             inst_key, side, entry_price, qty
         )
+        self._soa_stale = True
 
     def remove_trade(self, trade_id):
         if trade_id in self.active_trades:
             del self.active_trades[trade_id]
+            self._soa_stale = True
+
+    def _rebuild_soa(self):
+        open_trades = [(tid, t) for tid, t in self.active_trades.items() if not t.is_closed]
+
+        self._ids = [tid for tid, _ in open_trades]
+        self._objs = [t for _, t in open_trades]
+        self._insts = [t.inst_key for t in self._objs]
+        # +1 BUY / -1 SELL: multiplying by the sign turns every SELL
+        # comparison into the BUY one
+        self._sign = np.array([1.0 if t.side == "BUY" else -1.0 for t in self._objs])
+        self._entry = np.array([t.entry_price for t in self._objs], dtype=np.float64)
+        self._stop = np.array([t.stop_loss for t in self._objs], dtype=np.float64)
+        self._target = np.array([t.target for t in self._objs], dtype=np.float64)
+        self._breakeven = np.array([t.breakeven_moved for t in self._objs], dtype=bool)
+        self._partial = np.array([t.partial_exit_done for t in self._objs], dtype=bool)
+        self._open = np.ones(len(self._objs), dtype=bool)
+        self._soa_stale = False
 
     def check_trades(self, current_prices):
         """
@@ -70,56 +98,64 @@ class TradeMonitor:
         current_prices: dict { inst_key: current_price }
         """
 
-        exits = []
+        if self._soa_stale:
+            self._rebuild_soa()
+
+        if not self._ids:
+            return []
+
+        px = np.array([current_prices.get(k, np.nan) for k in self._insts], dtype=np.float64)
+        live = self._open & ~np.isnan(px)
+        if not live.any():
+            return []
+
+        sign = self._sign
+        entry = self._entry
+        profit_pct = sign * (px - entry) / entry
+
+        # 1) STOP LOSS / 2) TARGET
+        stop_hit = live & (sign * px <= sign * self._stop)
+        target_hit = live & ~stop_hit & (sign * px >= sign * self._target)
+        running = live & ~stop_hit & ~target_hit
+
+        # 3) BREAKEVEN STEP
+        move_be = running & ~self._breakeven & (profit_pct >= BREAKEVEN_MOVE_PCT)
+        if move_be.any():
+            self._stop[move_be] = entry[move_be]
+            self._breakeven |= move_be
+            for i in np.flatnonzero(move_be):
+                trade = self._objs[i]
+                trade.stop_loss = trade.entry_price
+                trade.breakeven_moved = True
+
+        # 4) PARTIAL EXIT (0.7 move then fail back)
+        exit_level = np.where(
+            sign > 0,
+            entry * (1 + PARTIAL_EXIT_LIMIT_PCT),
+            entry * (1 - PARTIAL_EXIT_LIMIT_PCT)
+        )
+        partial_hit = (
+            running
+            & ~self._partial
+            & (profit_pct >= PARTIAL_EXIT_MOVE_PCT)
+            & (sign * px <= sign * exit_level)
+        )
 
-        for trade_id, trade in list(self.active_trades.items()):
-            if trade.is_closed:
-                continue
-
-            ltp = current_prices.get(trade.inst_key)
-            if ltp is None:
-                continue
-
-            profit_pct = trade.get_current_profit_pct(ltp)
-
-            # 1) STOP LOSS
-            if trade.side == "BUY" and ltp <= trade.stop_loss:
-                exits.append((trade_id, "STOP_LOSS", ltp))
-                trade.is_closed = True
-                continue
-            if trade.side == "SELL" and ltp >= trade.stop_loss:
-                exits.append((trade_id, "STOP_LOSS", ltp))
-                trade.is_closed = True
-                continue
-
-            # 2) TARGET
-            if trade.side == "BUY" and ltp >= trade.target:
-                exits.append((trade_id, "TARGET", ltp))
-                trade.is_closed = True
-                continue
-            if trade.side == "SELL" and ltp <= trade.target:
-                exits.append((trade_id, "TARGET", ltp))
-                trade.is_closed = True
-                continue
-
-            # 3) BREAKEVEN STEP
-            if not trade.breakeven_moved:
-                if profit_pct >= BREAKEVEN_MOVE_PCT:
-                    trade.stop_loss = trade.entry_price
-                    trade.breakeven_moved = True
-
-            # 4) PARTIAL EXIT (0.7 move then fail back)
-            if not trade.partial_exit_done:
-                if profit_pct >= PARTIAL_EXIT_MOVE_PCT:
-                    # reached the zone for partial exit
-                    # now check if retraces below threshold
-                    if trade.side == "BUY" and ltp <= trade.entry_price * (1 + PARTIAL_EXIT_LIMIT_PCT):
-                        exits.append((trade_id, "PARTIAL_EXIT", ltp))
-                        trade.is_closed = True
-                        continue
-                    if trade.side == "SELL" and ltp >= trade.entry_price * (1 - PARTIAL_EXIT_LIMIT_PCT):
-                        exits.append((trade_id, "PARTIAL_EXIT", ltp))
-                        trade.is_closed = True
-                        continue
+        hit = stop_hit | target_hit | partial_hit
+        if not hit.any():
+            return []
 
+        exits = []
+        for i in np.flatnonzero(hit):
+            if stop_hit[i]:
+                reason = "STOP_LOSS"
+            elif target_hit[i]:
+                reason = "TARGET"
+            else:
+                reason = "PARTIAL_EXIT"
+            ltp = current_prices[self._insts[i]]
+            exits.append((self._ids[i], reason, ltp))
+            self._objs[i].is_closed = True
+
+        self._open &= ~hit
         return exits
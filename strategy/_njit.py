@@ -0,0 +1,54 @@
+# strategy/_njit.py
+"""
+Optional numba support.
+
+numba is not a hard dependency: when it is installed, `njit` is numba's
+decorator and the kernels are compiled; otherwise `njit` returns the
+function unchanged and callers should prefer their NumPy path
+(check HAVE_NUMBA), since scalar loops over arrays are slow in CPython.
+
+Kernels use cache=True, so after the first run compiled code is loaded from
+__pycache__. warm_up() forces compilation (or the cache load) at startup
+instead of on the first live bar. Run `python -m strategy._njit` at deploy
+time to populate that cache before the session, the build-step
+equivalent of AOT compilation.
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # supports both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+def warm_up():
+    """
+    Call every njit kernel once on tiny inputs so a live bar-close callback
+    never pays the compile. No-op without numba.
+    """
+    if not HAVE_NUMBA:
+        return
+
+    import numpy as np
+    from strategy._pullback_kernel import rejection_code
+    from strategy.market_regime import _tr_dm_sums
+    from strategy.volatility_filter import _tr_sum
+
+    rejection_code(1.0, 1.0, 1.0, 1.0)
+    bars = np.ones(3, dtype=np.float64)
+    _tr_dm_sums(bars, bars, bars)
+    _tr_sum(bars, bars, bars)
+
+
+if __name__ == "__main__":
+    warm_up()
+    print(f"[njit] kernels {'compiled and cached' if HAVE_NUMBA else 'skipped (numba not installed)'}")
@@ -0,0 +1,52 @@
+# strategy/_pullback_kernel.py
+"""
+Numeric kernel behind detect_pullback_signal.
+
+The detector only needs the direction of the last bar's rejection wick,
+not rejection_info's full dict (six rounded fields). This computes that
+as an int code with plain float arithmetic, compiled when numba is
+available (see strategy._njit) and plain Python otherwise.
+"""
+
+from strategy._njit import njit
+
+# rejection_info rejection_type as an int: "BULLISH" / "BEARISH" / None
+REJECTION_NONE = 0
+REJECTION_BULLISH = 1
+REJECTION_BEARISH = -1
+
+
+@njit(cache=True)
+def rejection_code(open_p, high, low, close):
+    """rejection_info(...)["rejection_type"] as +1 / -1 / 0."""
+    body = abs(close - open_p)
+    total_range = high - low
+    if total_range < 1e-9:
+        total_range = 1e-9
+
+    top = close if close > open_p else open_p
+    bottom = close if close < open_p else open_p
+    upper_wick = high - top
+    if upper_wick < 0.0:
+        upper_wick = 0.0
+    lower_wick = bottom - low
+    if lower_wick < 0.0:
+        lower_wick = 0.0
+
+    upper_rel = upper_wick / total_range
+    lower_rel = lower_wick / total_range
+    body_rel = body / total_range
+
+    if lower_rel > body_rel * 1.5 and lower_rel > 0.12:
+        code = REJECTION_BULLISH
+        score = (lower_rel - 0.12) / 0.6
+    elif upper_rel > body_rel * 1.5 and upper_rel > 0.12:
+        code = REJECTION_BEARISH
+        score = (upper_rel - 0.12) / 0.6
+    else:
+        return REJECTION_NONE
+
+    # small noise guard (score is capped at 1.0, which never trips it)
+    if score < 0.05:
+        return REJECTION_NONE
+    return code
@@ -0,0 +1,31 @@
+# strategy/bar_panel.py
+"""
+BarPanel — one struct-of-arrays bundle of OHLCV series.
+
+Built once per evaluation (from MarketScanner views or MTFBuilder
+aggregates) and handed to every indicator that needs it, so each consumer
+reads the same float64 arrays instead of re-extracting fields from bar
+dicts.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+_EMPTY = np.empty(0, dtype=np.float64)
+_EMPTY.flags.writeable = False
+
+
+@dataclass(slots=True, frozen=True)
+class BarPanel:
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    def __len__(self):
+        return len(self.c)
+
+
+EMPTY_PANEL = BarPanel(_EMPTY, _EMPTY, _EMPTY, _EMPTY, _EMPTY)
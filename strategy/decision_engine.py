@@ -3,18 +3,21 @@
 from dataclasses import dataclass
 from typing import Optional, Dict
 
-from strategy.volume_filter import analyze_volume
-from strategy.volatility_filter import analyze_volatility, compute_atr
+import numpy as np
+
+from strategy.volatility_filter import compute_atr, volatility_score
+from strategy.volume_filter import volume_score
 from strategy.price_action import price_action_context
 from strategy.sr_levels import sr_location_score
 from strategy.vwap_filter import VWAPContext
+from strategy.direction import Direction
 
 
 # =========================
 # Output Structure
 # =========================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DecisionResult:
     state: str                 # IGNORE | PREPARE_LONG | PREPARE_SHORT | EXECUTE_LONG | EXECUTE_SHORT
     score: float               # 0 – 10
@@ -23,22 +26,85 @@ class DecisionResult:
     reason: str
 
 
+# =========================
+# Score Thresholds
+# =========================
+
+EXECUTE_SCORE = 6.5
+PREPARE_SCORE = 5.0
+
+# prebuilt state strings (no per-call f-string formatting)
+_STATE_NAMES = {
+    (stage, side): f"{stage}_{side}"
+    for stage in ("EXECUTE", "PREPARE")
+    for side in ("LONG", "SHORT")
+}
+
+
+# =========================
+# Participation Scores
+# =========================
+
+def _participation_scores(
+    volumes,
+    move: float,
+    atr: Optional[float],
+    lookback: int = 20,
+    rising_bars: int = 3
+):
+    """
+    Volume + volatility scores: the same values as analyze_volume(...).score
+    and analyze_volatility(...).score, without building the context objects
+    the decision engine never reads.
+    """
+
+    vol_score = volume_score(volumes, lookback=lookback, rising_bars=rising_bars)
+
+    # ----------------------
+    # Volatility
+    # ----------------------
+    if atr is None or atr <= 0:
+        volat_score = 0.0
+    else:
+        volat_score = volatility_score(abs(move) / atr)
+
+    return vol_score, volat_score
+
+
 # =========================
 # CLEAN DECISION ENGINE
 # =========================
 
 def final_trade_decision(
     inst_key: str,
-    prices: list[float],
-    highs: list[float],
-    lows: list[float],
-    closes: list[float],
-    volumes: list[float],
+    prices: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    volumes: np.ndarray,
     market_regime: str,
-    htf_bias_direction: str,
+    htf_bias: int,
     vwap_ctx: VWAPContext,
     pullback_signal: Optional[Dict],
+    atr: Optional[float] = None,
+    range_high: Optional[float] = None,
+    range_low: Optional[float] = None,
+    recent_high: Optional[float] = None,
+    recent_low: Optional[float] = None,
 ) -> DecisionResult:
+    """
+    prices/highs/lows/closes/volumes: float64 arrays, oldest -> newest
+         (MarketScanner views); plain lists also work.
+    htf_bias: Direction code of the HTF bias (HTFBias.code).
+    atr: precomputed ATR for this bar (e.g. MarketScanner.atr).
+         Computed from highs/lows/closes when not supplied.
+    range_high / range_low: breakout base, highest/lowest of the two closes
+         before the current bar (e.g. MarketScanner.range_high/range_low).
+         Computed from closes when not supplied.
+    recent_high / recent_low: pullback swing extrema of the closes before the
+         current bar (MarketScanner.recent_high/recent_low(inst_key, PULLBACK_LOOKBACK)).
+         Computed from closes when not supplied.
+    """
 
     components: Dict[str, float] = {}
     score = 0.0
@@ -58,10 +124,9 @@ def final_trade_decision(
     # 2️⃣ HTF AUTHORITY
     # ==================================================
 
-    if direction == "LONG" and htf_bias_direction != "BULLISH":
-        return DecisionResult("IGNORE", 0.0, None, {}, "htf mismatch")
-
-    if direction == "SHORT" and htf_bias_direction != "BEARISH":
+    # LONG needs BULLISH (+1), SHORT needs BEARISH (-1)
+    side = Direction.LONG if direction == "LONG" else Direction.SHORT
+    if htf_bias != side:
         return DecisionResult("IGNORE", 0.0, None, {}, "htf mismatch")
 
     components["htf"] = 2.0
@@ -95,23 +160,20 @@ def final_trade_decision(
     score += vwap_ctx.score
 
     # ==================================================
-    # 5️⃣ VOLUME (SOFT CONFIRMATION)
+    # 5️⃣ VOLUME + 6️⃣ VOLATILITY (SOFT CONFIRMATION)
     # ==================================================
 
-    vol_ctx = analyze_volume(volumes, close_prices=closes)
-    components["volume"] = vol_ctx.score
-    score += vol_ctx.score
+    if atr is None:
+        atr = compute_atr(highs, lows, closes)
+    move = float(closes[-1] - closes[-2]) if len(closes) > 1 else 0.0
 
-    # ==================================================
-    # 6️⃣ VOLATILITY (SOFT CONFIRMATION)
-    # ==================================================
+    vol_score, volat_score = _participation_scores(volumes, move, atr)
 
-    atr = compute_atr(highs, lows, closes)
-    move = closes[-1] - closes[-2] if len(closes) > 1 else 0.0
+    components["volume"] = vol_score
+    score += vol_score
 
-    volat_ctx = analyze_volatility(move, atr)
-    components["volatility"] = volat_ctx.score
-    score += volat_ctx.score
+    components["volatility"] = volat_score
+    score += volat_score
 
     # ==================================================
     # 7️⃣ PRICE ACTION
@@ -122,7 +184,9 @@ def final_trade_decision(
         highs=highs,
         lows=lows,
         opens=closes,
-        closes=closes
+        closes=closes,
+        recent_high=recent_high,
+        recent_low=recent_low
     )
 
     components["price_action"] = pa_ctx["score"]
@@ -133,7 +197,7 @@ def final_trade_decision(
     # ==================================================
 
     nearest = pullback_signal.get("nearest_level")
-    sr_score = sr_location_score(closes[-1], nearest, direction)
+    sr_score = sr_location_score(float(closes[-1]), nearest, direction)
 
     components["sr"] = sr_score
     score += sr_score
@@ -142,8 +206,13 @@ def final_trade_decision(
     # 9️⃣ BREAKOUT TRIGGER (KEY FIX)
     # ==================================================
 
-    recent_high = max(closes[-3:-1])
-    recent_low = min(closes[-3:-1])
+    if range_high is None or range_low is None:
+        base = np.asarray(closes[-3:-1], dtype=np.float64)
+        range_high = base.max() if range_high is None else range_high
+        range_low = base.min() if range_low is None else range_low
+
+    recent_high = range_high
+    recent_low = range_low
 
     trigger_ok = False
 
@@ -159,31 +228,23 @@ def final_trade_decision(
 
     score = round(max(min(score, 10.0), 0.0), 2)
 
-    if score >= 6.5:
-        if trigger_ok:
-            return DecisionResult(
-                state=f"EXECUTE_{direction}",
-                score=score,
-                direction=direction,
-                components=components,
-                reason="breakout confirmed"
-            )
-        else:
-            return DecisionResult(
-                state=f"PREPARE_{direction}",
-                score=score,
-                direction=direction,
-                components=components,
-                reason="waiting breakout"
-            )
-
-    elif score >= 5.0:
-        return DecisionResult(
-            state=f"PREPARE_{direction}",
-            score=score,
-            direction=direction,
-            components=components,
-            reason="setup forming"
-        )
-
-    return DecisionResult("IGNORE", score, None, components, "low quality")
+    # band 0: EXECUTE (needs trigger) / 1: PREPARE / 2: IGNORE
+    band = 0 if score >= EXECUTE_SCORE else 1 if score >= PREPARE_SCORE else 2
+
+    if band == 2:
+        return DecisionResult("IGNORE", score, None, components, "low quality")
+
+    if band == 0 and trigger_ok:
+        state, reason = _STATE_NAMES[("EXECUTE", direction)], "breakout confirmed"
+    elif band == 0:
+        state, reason = _STATE_NAMES[("PREPARE", direction)], "waiting breakout"
+    else:
+        state, reason = _STATE_NAMES[("PREPARE", direction)], "setup forming"
+
+    return DecisionResult(
+        state=state,
+        score=score,
+        direction=direction,
+        components=components,
+        reason=reason
+    )
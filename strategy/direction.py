@@ -0,0 +1,19 @@
+# strategy/direction.py
+
+from enum import IntEnum
+
+
+class Direction(IntEnum):
+    """
+    Signed direction code for hot-path comparisons (int compare, no strings).
+
+    BULLISH / LONG = +1, BEARISH / SHORT = -1, NEUTRAL = 0.
+    The string labels stay on the context dataclasses for logging.
+    """
+    BEARISH = -1
+    NEUTRAL = 0
+    BULLISH = 1
+
+    # trade-side aliases (same members)
+    SHORT = -1
+    LONG = 1
@@ -1,6 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional, List, Dict
-from strategy.indicators import exponential_moving_average
+from typing import Optional, List, Dict, Union
+
+import numpy as np
+
+from strategy.indicators import ema_series
+from strategy.bar_panel import BarPanel
+from strategy.direction import Direction
 
 
 # ------------------------
@@ -12,13 +17,28 @@ class HTFBias:
     strength: float
     label: str
     comment: str
+    code: Direction = Direction.NEUTRAL   # int form of `direction`
+
+
+# code -> (direction, strong label, weak label)
+_DIRECTION_LABELS = {
+    Direction.BULLISH: ("BULLISH", "BULLISH_STRONG", "BULLISH_WEAK"),
+    Direction.BEARISH: ("BEARISH", "BEARISH_STRONG", "BEARISH_WEAK"),
+}
+
+# code -> (comment when price sits beyond VWAP in the bias direction,
+#          comment when it sits beyond VWAP against it)
+_VWAP_COMMENTS = {
+    Direction.BULLISH: ("Above VWAP", "Below VWAP pressure"),
+    Direction.BEARISH: ("Below VWAP", "Above VWAP pressure"),
+}
 
 
 # ------------------------
 # HTF Bias Logic (5m candles)
 # ------------------------
 def get_htf_bias(
-    candles_5m: List[Dict],
+    candles_5m: Union[List[Dict], BarPanel],
     vwap_value: Optional[float] = None,
     short_period: int = 21,
     long_period: int = 55,
@@ -35,31 +55,43 @@ def get_htf_bias(
         "low": ...,
         "close": ...
     }
+
+    candles_5m may also be a BarPanel (e.g. MTFBuilder.get_tf_panel); its
+    close array is used directly.
     """
 
     if not candles_5m or len(candles_5m) < long_period + 5:
         return HTFBias("NEUTRAL", 0.5, "NEUTRAL", "Insufficient 5m data")
 
     # Extract close prices
-    prices = [c["close"] for c in candles_5m]
+    if isinstance(candles_5m, BarPanel):
+        prices = candles_5m.c
+    else:
+        prices = np.asarray([c["close"] for c in candles_5m], dtype=np.float64)
 
-    ema_short = exponential_moving_average(prices, short_period)
-    ema_long = exponential_moving_average(prices, long_period)
+    # one pass per period; the maturity check below reads the same
+    # series 5 bars back instead of recomputing EMAs over prices[:-5]
+    ema_s = ema_series(prices, short_period)
+    ema_l = ema_series(prices, long_period)
+    ema_short, ema_long = float(ema_s[-1]), float(ema_l[-1])
+    past_short, past_long = float(ema_s[-6]), float(ema_l[-6])
 
-    if ema_short is None or ema_long is None:
+    if np.isnan(ema_short) or np.isnan(ema_long):
         return HTFBias("NEUTRAL", 0.5, "NEUTRAL", "EMA unavailable")
 
-    price = prices[-1]
+    price = float(prices[-1])
 
     # ------------------------
     # Direction
     # ------------------------
+    # tracked as a signed int code; strings are only looked up for the
+    # returned HTFBias
     ema_diff = ema_short - ema_long
 
     if ema_diff > 0:
-        direction = "BULLISH"
+        code = Direction.BULLISH
     elif ema_diff < 0:
-        direction = "BEARISH"
+        code = Direction.BEARISH
     else:
         return HTFBias("NEUTRAL", 1.0, "NEUTRAL", "Flat EMA")
 
@@ -67,9 +99,7 @@ def get_htf_bias(
     # Strength (structure)
     # ------------------------
     lookback = min(20, len(prices))
-    recent = prices[-lookback:]
-
-    recent_range = max(recent) - min(recent)
+    recent_range = float(np.ptp(prices[-lookback:]))
 
     if recent_range <= 0:
         base_strength = 1.5
@@ -84,20 +114,13 @@ def get_htf_bias(
     # ------------------------
     if len(prices) >= long_period + 10:
 
-        past_prices = prices[:-5]
-
-        past_short = exponential_moving_average(past_prices, short_period)
-        past_long = exponential_moving_average(past_prices, long_period)
-
+        # past_short / past_long: EMAs over prices[:-5]
         if past_short and past_long:
 
             past_diff = past_short - past_long
 
-            if direction == "BULLISH" and past_diff > 0:
-                strength += 1.0
-                comment.append("Trend persistence")
-
-            if direction == "BEARISH" and past_diff < 0:
+            # same sign as the current EMA spread
+            if code * past_diff > 0:
                 strength += 1.0
                 comment.append("Trend persistence")
 
@@ -106,27 +129,17 @@ def get_htf_bias(
     # ------------------------
     if vwap_value:
 
-        dist = (price - vwap_value) / vwap_value
-
-        if direction == "BULLISH":
-
-            if dist > vwap_tolerance:
-                strength += 1.0
-                comment.append("Above VWAP")
-
-            elif dist < -vwap_tolerance:
-                strength -= 1.0
-                comment.append("Below VWAP pressure")
+        # distance measured in the bias direction: > 0 supports the bias
+        dist = code * (price - vwap_value) / vwap_value
+        with_bias, against_bias = _VWAP_COMMENTS[code]
 
-        else:
+        if dist > vwap_tolerance:
+            strength += 1.0
+            comment.append(with_bias)
 
-            if dist < -vwap_tolerance:
-                strength += 1.0
-                comment.append("Below VWAP")
-
-            elif dist > vwap_tolerance:
-                strength -= 1.0
-                comment.append("Above VWAP pressure")
+        elif dist < -vwap_tolerance:
+            strength -= 1.0
+            comment.append(against_bias)
 
     # ------------------------
     # Clamp strength
@@ -136,14 +149,12 @@ def get_htf_bias(
     # ------------------------
     # Label
     # ------------------------
-    if direction == "BULLISH":
-        label = "BULLISH_STRONG" if strength >= 7 else "BULLISH_WEAK"
-    else:
-        label = "BEARISH_STRONG" if strength >= 7 else "BEARISH_WEAK"
+    direction, strong_label, weak_label = _DIRECTION_LABELS[code]
 
     return HTFBias(
         direction=direction,
         strength=strength,
-        label=label,
-        comment=" | ".join(comment)
+        label=strong_label if strength >= 7 else weak_label,
+        comment=" | ".join(comment),
+        code=code
     )
@@ -2,6 +2,8 @@
 
 from collections import deque
 
+import numpy as np
+
 def simple_moving_average(prices, period):
     """
     Compute Simple Moving Average (SMA) for the given period.
@@ -31,6 +33,27 @@ def exponential_moving_average(prices, period):
     return ema_previous
 
 
+def ema_series(prices, period):
+    """
+    Full EMA series in one pass, as a float64 array aligned with `prices`.
+    out[i] is the EMA of prices[:i + 1] (step-by-step recurrence, same seed
+    as exponential_moving_average); entries before the first full period
+    are NaN.
+    """
+    values = prices.tolist() if isinstance(prices, np.ndarray) else list(prices)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+
+    multiplier = 2 / (period + 1)
+    ema_previous = sum(values[:period]) / period
+    out[period - 1] = ema_previous
+    for i in range(period, len(values)):
+        ema_previous = (values[i] - ema_previous) * multiplier + ema_previous
+        out[i] = ema_previous
+    return out
+
+
 def relative_strength_index(prices, period=14):
     """
     Compute RSI using a list of prices.
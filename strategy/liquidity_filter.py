@@ -1,7 +1,10 @@
 # strategy/liquidity_context.py
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Sequence
+
+import numpy as np
 
 
 # =========================
@@ -17,12 +20,32 @@ class LiquidityContext:
     comment: str
 
 
+# =========================
+# Level Ladder
+# =========================
+
+# avg volume thresholds as multiples of min_avg_volume (ascending); the
+# bisect index into _THRESH_MULT picks the row of _LEVELS
+_THRESH_MULT = (1, 2, 4)
+_LEVELS = (
+    ("ILLIQUID", -1.5, "Below minimum volume threshold"),
+    ("LOW", 0.5, "Low average volume"),
+    ("MEDIUM", 1.2, "Moderate average volume"),
+    ("HIGH", 2.0, "Very high average volume"),
+)
+
+
+def _level_thresholds(min_avg_volume: float) -> tuple:
+    """Absolute avg-volume cut points for _LEVELS, for bisect_right."""
+    return tuple(min_avg_volume * m for m in _THRESH_MULT)
+
+
 # =========================
 # Liquidity Intelligence
 # =========================
 
 def analyze_liquidity(
-    volume_history: List[float],
+    volume_history: Sequence[float],
     min_avg_volume: int = 400_000,
     lookback: int = 30
 ) -> LiquidityContext:
@@ -32,48 +55,45 @@ def analyze_liquidity(
     Interpret liquidity as:
       - HIGH / MEDIUM / LOW / ILLIQUID
     with an associated score in [-2 .. +2].
+
+    volume_history: list or float64 array (e.g. BarPanel.v).
     """
 
     # Safety: not enough data
-    if not volume_history or len(volume_history) < lookback:
-        return LiquidityContext(
-            score=-2.0,
-            level="ILLIQUID",
-            avg_volume=0.0,
-            consistency="UNSTABLE",
-            comment="Insufficient volume history"
-        )
-
-    recent = volume_history[-lookback:]
-    avg_vol = sum(recent) / lookback
+    if volume_history is None or len(volume_history) < lookback:
+        return _insufficient_context()
+
+    # float64 view when given an array (no per-element boxing)
+    recent = np.asarray(volume_history[-lookback:], dtype=np.float64)
+    avg_vol = float(recent.sum()) / lookback
+    non_zero_bars = int(np.count_nonzero(recent > 0))
 
     # -----------------------------
     # 1️⃣ Liquidity Level
     # -----------------------------
-    # Simple thresholds (tunable)
-    if avg_vol >= min_avg_volume * 4:
-        level = "HIGH"
-        base_score = 2.0
-        comment_base = "Very high average volume"
-    elif avg_vol >= min_avg_volume * 2:
-        level = "MEDIUM"
-        base_score = 1.2
-        comment_base = "Moderate average volume"
-    elif avg_vol >= min_avg_volume:
-        level = "LOW"
-        base_score = 0.5
-        comment_base = "Low average volume"
-    else:
-        level = "ILLIQUID"
-        base_score = -1.5
-        comment_base = "Below minimum volume threshold"
+    # Simple thresholds (tunable), see _THRESH_MULT / _LEVELS
+    idx = bisect_right(_level_thresholds(min_avg_volume), avg_vol)
+
+    return _liquidity_context(avg_vol, idx, non_zero_bars / lookback)
+
+
+def _insufficient_context() -> LiquidityContext:
+    return LiquidityContext(
+        score=-2.0,
+        level="ILLIQUID",
+        avg_volume=0.0,
+        consistency="UNSTABLE",
+        comment="Insufficient volume history"
+    )
+
+
+def _liquidity_context(avg_vol: float, idx: int, consistency_ratio: float) -> LiquidityContext:
+    """Build the context from the average volume, its _LEVELS row and the non-zero bar ratio."""
+    level, base_score, comment_base = _LEVELS[idx]
 
     # -----------------------------
     # 2️⃣ Consistency Check
     # -----------------------------
-    non_zero_bars = sum(1 for v in recent if v > 0)
-    consistency_ratio = non_zero_bars / lookback
-
     if consistency_ratio < 0.80:
         consistency = "UNSTABLE"
         score = base_score - 0.8
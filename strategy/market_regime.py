@@ -1,60 +1,89 @@
 # strategy/market_regime.py
 
-from typing import List, Optional
+from typing import Optional, Sequence, Union
 from dataclasses import dataclass
 
+import numpy as np
+
+from strategy._njit import njit, HAVE_NUMBA
+from strategy.volatility_filter import _bar_tr, compute_atr, compute_true_range  # noqa: F401  (re-exported)
+
+Series = Union[Sequence[float], np.ndarray]
+
 
 # =========================
 # Core Calculations
+# (vectorised over float64 arrays; TR / ATR are volatility_filter's)
 # =========================
 
-def compute_true_range(highs: List[float], lows: List[float], closes: List[float]) -> List[float]:
-    if len(highs) < 2:
-        return []
-    tr = []
-    for i in range(1, len(highs)):
-        tr.append(
-            max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i - 1]),
-                abs(lows[i] - closes[i - 1])
-            )
-        )
-    return tr
-
+def compute_adx(highs: Series, lows: Series, closes: Series, period: int = 14) -> Optional[float]:
+    _, adx = _compute_atr_adx(
+        np.asarray(highs, dtype=np.float64),
+        np.asarray(lows, dtype=np.float64),
+        np.asarray(closes, dtype=np.float64),
+        period
+    )
+    return adx
 
-def compute_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> Optional[float]:
-    tr = compute_true_range(highs, lows, closes)
-    if len(tr) < period:
-        return None
-    return sum(tr[-period:]) / period
 
+@njit(cache=True, nogil=True)
+def _tr_dm_sums(h, l, c):
+    """Sums of TR, +DM and -DM over bars 1..n-1 in one scalar loop."""
+    s_tr = 0.0
+    s_pdm = 0.0
+    s_mdm = 0.0
+    for i in range(1, h.shape[0]):
+        s_tr += _bar_tr(h, l, c, i)
 
-def compute_adx(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> Optional[float]:
-    if len(highs) < period + 1:
-        return None
+        up = h[i] - h[i - 1]
+        down = l[i - 1] - l[i]
+        if up > down and up > 0:
+            s_pdm += up
+        if down > up and down > 0:
+            s_mdm += down
+    return s_tr, s_pdm, s_mdm
 
-    plus_dm, minus_dm = [], []
 
-    for i in range(1, len(highs)):
-        up = highs[i] - highs[i - 1]
-        down = lows[i - 1] - lows[i]
+def _compute_atr_adx(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = 14):
+    """
+    (atr, adx) from one TR / DM pass over the last `period + 1` bars.
+    Same values as compute_atr() and compute_adx() (to float rounding on
+    the numba path); None where those return None. compute_adx() is a
+    thin wrapper over this.
+    """
+    if len(highs) < period + 1:
+        return None, None
+
+    tail = period + 1
+    h = highs[-tail:]
+    l = lows[-tail:]
+    c = closes[-tail:]
+
+    if HAVE_NUMBA:
+        # compiled single loop (sequential sums, so the last bits can
+        # differ from NumPy's pairwise summation)
+        s_tr, s_pdm, s_mdm = _tr_dm_sums(
+            np.ascontiguousarray(h), np.ascontiguousarray(l), np.ascontiguousarray(c)
+        )
+    else:
+        up = h[1:] - h[:-1]
+        down = l[:-1] - l[1:]
+        s_tr = float(compute_true_range(h, l, c).sum())
+        s_pdm = float(np.where((up > down) & (up > 0), up, 0.0).sum())
+        s_mdm = float(np.where((down > up) & (down > 0), down, 0.0).sum())
 
-        plus_dm.append(up if up > down and up > 0 else 0)
-        minus_dm.append(down if down > up and down > 0 else 0)
+    atr = s_tr / period
 
-    atr = compute_atr(highs, lows, closes, period)
-    if atr is None or atr == 0:
-        return None
+    if atr == 0:
+        return atr, None
 
-    plus_di = (sum(plus_dm[-period:]) / atr) * 100
-    minus_di = (sum(minus_dm[-period:]) / atr) * 100
+    plus_di = (s_pdm / atr) * 100
+    minus_di = (s_mdm / atr) * 100
 
     if plus_di + minus_di == 0:
-        return 0.0
+        return atr, 0.0
 
-    dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100
-    return dx
+    return atr, abs(plus_di - minus_di) / (plus_di + minus_di) * 100
 
 
 # =========================
@@ -74,10 +103,24 @@ class MarketRegime:
 # Regime Detection
 # =========================
 
+# state -> (mode, comment)
+_REGIME_META = {
+    "EARLY_TREND": ("TREND_DAY", "Fresh expansion with momentum"),
+    "TRENDING": ("TREND_DAY", "Established directional trend"),
+    "COMPRESSION": ("RANGE_DAY", "Volatility contraction"),
+    "EXHAUSTION": ("RANGE_DAY", "Trend losing energy"),
+    "WEAK": ("RANGE_DAY", "Low momentum / mixed structure"),
+}
+
+
+def _cap(x: float) -> float:
+    return max(0.0, min(10.0, x))
+
+
 def detect_market_regime(
-    highs: List[float],
-    lows: List[float],
-    closes: List[float],
+    highs: Series,
+    lows: Series,
+    closes: Series,
     index_regime: Optional["MarketRegime"] = None,
     min_bars: int = 30
 ) -> MarketRegime:
@@ -88,6 +131,8 @@ def detect_market_regime(
     - Detect STRUCTURAL state
     - Decide TRADING MODE (TREND vs RANGE)
     - Provide STRENGTH as confidence
+
+    Accepts lists or float64 arrays (e.g. MarketScanner views, used as-is).
     """
 
     # ---------------------
@@ -103,8 +148,11 @@ def detect_market_regime(
             comment="Insufficient data"
         )
 
-    adx = compute_adx(highs, lows, closes)
-    atr = compute_atr(highs, lows, closes)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    closes = np.asarray(closes, dtype=np.float64)
+
+    atr, adx = _compute_atr_adx(highs, lows, closes)
 
     if adx is None or atr is None:
         return MarketRegime(
@@ -120,79 +168,61 @@ def detect_market_regime(
     # ---------------------
 
     recent_n = min(10, len(closes))
-    avg_price = sum(closes[-recent_n:]) / recent_n if recent_n > 0 else 1.0
+    avg_price = float(closes[-recent_n:].sum()) / recent_n if recent_n > 0 else 1.0
     vol_norm = atr / avg_price if avg_price > 0 else 0.0
 
     # ---------------------
     # Range Comparison
     # ---------------------
 
-    recent_range = max(highs[-10:]) - min(lows[-10:])
+    recent_range = float(highs[-10:].max() - lows[-10:].min())
     prev_highs = highs[-20:-10] if len(highs) >= 20 else highs[:len(highs)//2]
     prev_lows = lows[-20:-10] if len(lows) >= 20 else lows[:len(lows)//2]
-    prev_range = (max(prev_highs) - min(prev_lows)) if prev_highs and prev_lows else 0.0
+    prev_range = float(prev_highs.max() - prev_lows.min()) if len(prev_highs) and len(prev_lows) else 0.0
     if prev_range <= 0:
         prev_range = max(recent_range * 0.8, 1e-9)
 
-    def cap(x: float) -> float:
-        return max(0.0, min(10.0, x))
-
     # =====================
     # REGIME LOGIC
     # =====================
 
-    # EARLY TREND
-    if adx >= 18 and recent_range > prev_range * 1.3:
-        strength = cap(4.5 + (adx - 18) * 0.2)
+    # adx < 18 rules out both trend states, so they are only tested
+    # behind that one comparison
+    state = None
+    if adx >= 18:
+        if recent_range > prev_range * 1.3:
+            state = "EARLY_TREND"
+            strength = _cap(4.5 + (adx - 18) * 0.2)
+        elif adx >= 28:
+            state = "TRENDING"
+            strength = _cap(6.5 + (adx - 28) * 0.15)
+
+    if state is None and recent_range < prev_range * 0.7:
+        state = "COMPRESSION"
+        strength = _cap(2.5 + (prev_range - recent_range) / (prev_range + 1e-9))
+
+    # EXHAUSTION (adx > 28, range < 0.85 x prev, vol_norm < 0.008) can never
+    # be reached: any adx > 28 is already TRENDING above. Kept in _REGIME_META
+    # so the state name stays documented.
+
+    if state is not None:
+        mode, comment = _REGIME_META[state]
         return MarketRegime(
-            state="EARLY_TREND",
-            mode="TREND_DAY",
-            strength=strength,
-            volatility=vol_norm,
-            comment="Fresh expansion with momentum"
-        )
-
-    # TRENDING
-    if adx >= 28:
-        strength = cap(6.5 + (adx - 28) * 0.15)
-        return MarketRegime(
-            state="TRENDING",
-            mode="TREND_DAY",
-            strength=strength,
-            volatility=vol_norm,
-            comment="Established directional trend"
-        )
-
-    # COMPRESSION
-    if recent_range < prev_range * 0.7:
-        strength = cap(2.5 + (prev_range - recent_range) / (prev_range + 1e-9))
-        return MarketRegime(
-            state="COMPRESSION",
-            mode="RANGE_DAY",
-            strength=strength,
-            volatility=vol_norm,
-            comment="Volatility contraction"
-        )
-
-    # EXHAUSTION
-    if adx > 28 and recent_range < prev_range * 0.85 and vol_norm < 0.008:
-        strength = cap(3.5 + (adx - 28) * 0.1)
-        return MarketRegime(
-            state="EXHAUSTION",
-            mode="RANGE_DAY",
+            state=state,
+            mode=mode,
             strength=strength,
             volatility=vol_norm,
-            comment="Trend losing energy"
+            comment=comment
         )
 
     # DEFAULT: WEAK / CHOPPY
-    strength = cap(1.5 + (adx / 30.0) * 1.2)
+    mode, comment = _REGIME_META["WEAK"]
     regime = MarketRegime(
         state="WEAK",
-        mode="RANGE_DAY",
-        strength=strength,
+        mode=mode,
+        strength=_cap(1.5 + (adx / 30.0) * 1.2),
         volatility=vol_norm,
-        comment="Low momentum / mixed structure"
+        comment=comment
     )
 
     # ---------------------
@@ -202,10 +232,10 @@ def detect_market_regime(
     if index_regime:
         try:
             if index_regime.mode == "TREND_DAY":
-                regime.strength = cap(regime.strength + min(1.2, index_regime.strength * 0.15))
+                regime.strength = _cap(regime.strength + min(1.2, index_regime.strength * 0.15))
                 regime.comment += " | aligned with index trend"
             else:
-                regime.strength = cap(regime.strength - 0.7)
+                regime.strength = _cap(regime.strength - 0.7)
                 regime.comment += " | index not trending"
         except Exception:
             pass
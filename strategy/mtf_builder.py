@@ -5,19 +5,39 @@ MTFBuilder — build higher-timeframe candles from 1-minute bars.
 Design goals:
 - No extra API calls (aggregate 1m bars you already have).
 - Low latency: aggregates the last N 1-minute bars immediately.
-- Memory-safe: uses deque with configurable maxlen.
+- Memory-safe: bounded per-instrument buffers (configurable max_1m_bars).
+- Columnar storage: one float64 column per OHLCV field, so aggregation is
+  a NumPy reduction over a contiguous slice instead of a walk over dicts.
+  Bar times are int64 minute indexes (day ordinal * 1440 + minute of day),
+  turned back into ISO strings only for returned candles.
 - Simple, deterministic API: update(...) + get_latest_tf(...) / get_tf_history(...).
 """
 
-from collections import defaultdict, deque
-from datetime import datetime
-from typing import Deque, Dict, List, Optional, Union
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from strategy.bar_panel import BarPanel, EMPTY_PANEL
+from strategy.series_buffer import SeriesBuffer, OPEN, HIGH, LOW, CLOSE, VOLUME
 
 ISOFMT = "%Y-%m-%dT%H:%M:%S"
 
 
-def _to_minute_iso(ts: Union[str, datetime]) -> str:
+# "YYYY-MM-DD" <-> proleptic day ordinal, memoised (one entry per trading day)
+_DAY_ORDINAL: Dict[str, int] = {}
+_DAY_ISO: Dict[int, str] = {}
+
+
+def _to_minute_index(ts: Union[str, datetime]) -> int:
+    """Minute index of `ts` (seconds dropped): day ordinal * 1440 + minute of day."""
     if isinstance(ts, str):
+        # fast path: "YYYY-MM-DDTHH:MM:SS" -- read the fields by slicing
+        # instead of a strptime round trip
+        if len(ts) == 19 and ts[4] == "-" and ts[10] == "T" and ts[13] == ":" and ts[16] == ":":
+            day = ts[:10]
+            ordinal = _DAY_ORDINAL.get(day)
+            if ordinal is None:
+                ordinal = _DAY_ORDINAL[day] = date(int(ts[:4]), int(ts[5:7]), int(ts[8:10])).toordinal()
+            return ordinal * 1440 + int(ts[11:13]) * 60 + int(ts[14:16])
         try:
             dt = datetime.strptime(ts, ISOFMT)
         except Exception:
@@ -25,8 +45,17 @@ def _to_minute_iso(ts: Union[str, datetime]) -> str:
             dt = datetime.fromisoformat(ts)
     else:
         dt = ts
-    dt = dt.replace(second=0, microsecond=0)
-    return dt.strftime(ISOFMT)
+    return dt.toordinal() * 1440 + dt.hour * 60 + dt.minute
+
+
+def _minute_iso(index: int) -> str:
+    """Inverse of _to_minute_index: "YYYY-MM-DDTHH:MM:00"."""
+    ordinal, minute = divmod(int(index), 1440)
+    day = _DAY_ISO.get(ordinal)
+    if day is None:
+        day = _DAY_ISO[ordinal] = date.fromordinal(ordinal).isoformat()
+    hour, minute = divmod(minute, 60)
+    return f"{day}T{hour:02d}:{minute:02d}:00"
 
 
 class MTFBuilder:
@@ -37,35 +66,43 @@ class MTFBuilder:
       - Call update(inst_key, timestamp, o,h,l,c,v) for each 1-minute bar (or register a callback on bar close).
       - Use get_latest_tf(inst_key, minutes=5) to get aggregated candle for last `minutes` 1-minute bars.
       - Use get_tf_history(inst_key, minutes=5, lookback=3) to get last 3 aggregated 5-min candles (oldest->newest).
+      - Use get_mtf_bundle(inst_key, (5, 15), 3) for latest candle + history of several TFs at once.
     """
 
     def __init__(self, max_1m_bars: int = 2000):
-        # store recent 1-minute bars per instrument
-        # each element is dict: {"time": "YYYY-MM-DDTHH:MM:SS", "open":, "high":, "low":, "close":, "volume":}
+        # store recent 1-minute bars per instrument (columnar SeriesBuffer with minute-index times)
         self.max_1m_bars = max_1m_bars
-        self.buffers: Dict[str, Deque[dict]] = defaultdict(lambda: deque(maxlen=self.max_1m_bars))
+        self.buffers: Dict[str, SeriesBuffer] = {}
 
     def update(self, inst_key: str, timestamp: Union[str, datetime], o: float, h: float, l: float, c: float, v: float):
         """
         Add a 1-minute bar. timestamp may be ISO string or datetime.
         We normalize to minute boundary automatically.
+        A bar for the same minute as the newest one replaces it (a minute
+        still forming from ticks), so each minute is stored once.
         """
-        t_iso = _to_minute_iso(timestamp)
-        bar = {"time": t_iso, "open": o, "high": h, "low": l, "close": c, "volume": v}
-        self.buffers[inst_key].append(bar)
-
-    def _aggregate(self, bars: List[dict]) -> dict:
+        t_min = _to_minute_index(timestamp)
+        buf = self.buffers.get(inst_key)
+        if buf is None:
+            buf = self.buffers[inst_key] = SeriesBuffer(self.max_1m_bars, timed=True)
+        if len(buf) and buf.t[buf.end - 1] == t_min:
+            buf.set_last_row(o, h, l, c, v)
+        else:
+            buf.append_row(o, h, l, c, v, t_min)
+
+    def _aggregate(self, buf: SeriesBuffer, start: int, end: int) -> dict:
         """
-        Aggregate a list of 1-minute bar dicts (oldest->newest) into one N-minute candle.
+        Aggregate 1-minute bars [start, end) of `buf` (absolute column
+        indices, oldest->newest) into one N-minute candle.
         """
         return {
-            "time_start": bars[0]["time"],
-            "time_end": bars[-1]["time"],
-            "open": bars[0]["open"],
-            "high": max(b["high"] for b in bars),
-            "low": min(b["low"] for b in bars),
-            "close": bars[-1]["close"],
-            "volume": sum(b.get("volume", 0) for b in bars)
+            "time_start": _minute_iso(buf.t[start]),
+            "time_end": _minute_iso(buf.t[end - 1]),
+            "open": float(buf.data[OPEN, start]),
+            "high": float(buf.data[HIGH, start:end].max()),
+            "low": float(buf.data[LOW, start:end].min()),
+            "close": float(buf.data[CLOSE, end - 1]),
+            "volume": float(buf.data[VOLUME, start:end].sum())
         }
 
     def get_latest_tf(self, inst_key: str, minutes: int = 5) -> Optional[dict]:
@@ -73,11 +110,10 @@ class MTFBuilder:
         Return aggregated candle of the last `minutes` 1-minute bars (oldest->newest inside).
         If not enough bars, returns None.
         """
-        bars = self.buffers.get(inst_key)
-        if not bars or len(bars) < minutes:
+        buf = self.buffers.get(inst_key)
+        if buf is None or len(buf) < minutes:
             return None
-        chunk = list(bars)[-minutes:]
-        return self._aggregate(chunk)
+        return self._aggregate(buf, buf.end - minutes, buf.end)
 
     def get_tf_history(self, inst_key: str, minutes: int = 5, lookback: int = 3) -> List[dict]:
         """
@@ -86,23 +122,94 @@ class MTFBuilder:
         Each aggregated candle uses contiguous blocks of `minutes` 1-minute bars.
         If there isn't enough data to fill all lookback candles, returns as many as possible.
         """
-        out: List[dict] = []
-        bars = self.buffers.get(inst_key)
-        if not bars:
-            return out
-
-        bar_list = list(bars)
-        total = len(bar_list)
-        # compute aggregated windows from the tail
-        for i in range(lookback, 0, -1):
-            end = total - (i - 1) * minutes
-            start = end - minutes
-            if start < 0:
-                continue
-            chunk = bar_list[start:end]
-            out.append(self._aggregate(chunk))
-
-        return out
+        buf = self.buffers.get(inst_key)
+        if buf is None:
+            return []
+        return self._tf_history(buf, minutes, lookback)
+
+    def get_mtf_bundle(self, inst_key: str, timeframes: Tuple[int, ...] = (5, 15),
+                       lookback: int = 3) -> Dict[int, Tuple[Optional[dict], List[dict]]]:
+        """
+        {minutes: (latest candle, history)} for every TF in `timeframes`,
+        with one buffer lookup. Same values as get_latest_tf() /
+        get_tf_history(): windows are aligned to the newest bar, so the
+        latest candle is the last history candle (None while fewer than
+        `minutes` bars exist).
+        """
+        buf = self.buffers.get(inst_key)
+        bundle = {}
+        for minutes in timeframes:
+            history = self._tf_history(buf, minutes, lookback) if buf is not None else []
+            latest = history[-1] if history else None
+            bundle[minutes] = (latest, history)
+        return bundle
+
+    def _tf_history(self, buf: SeriesBuffer, minutes: int, lookback: int) -> List[dict]:
+        window = self._tf_window(buf, minutes, lookback)
+        if window is None:
+            return []
+
+        start, end, count = window
+        times = buf.t[start:end].reshape(count, minutes)
+        time_start = times[:, 0].tolist()
+        time_end = times[:, -1].tolist()
+        panel = self._tf_panel(buf, start, end, count, minutes)
+
+        opens = panel.o.tolist()
+        highs = panel.h.tolist()
+        lows = panel.l.tolist()
+        closes = panel.c.tolist()
+        volumes = panel.v.tolist()
+
+        return [
+            {
+                "time_start": _minute_iso(time_start[k]),
+                "time_end": _minute_iso(time_end[k]),
+                "open": opens[k],
+                "high": highs[k],
+                "low": lows[k],
+                "close": closes[k],
+                "volume": volumes[k]
+            }
+            for k in range(count)
+        ]
+
+    def get_tf_panel(self, inst_key: str, minutes: int = 5, lookback: int = 3) -> BarPanel:
+        """
+        Same candles as get_tf_history(), as a BarPanel of float64 arrays
+        (oldest -> newest) with no per-candle dicts.
+        """
+        buf = self.buffers.get(inst_key)
+        if buf is None:
+            return EMPTY_PANEL
+
+        window = self._tf_window(buf, minutes, lookback)
+        if window is None:
+            return EMPTY_PANEL
+
+        start, end, count = window
+        return self._tf_panel(buf, start, end, count, minutes)
+
+    @staticmethod
+    def _tf_window(buf: SeriesBuffer, minutes: int, lookback: int):
+        # windows are aligned to the newest bar
+        count = min(lookback, len(buf) // minutes)
+        if count <= 0:
+            return None
+        end = buf.end
+        return end - count * minutes, end, count
+
+    @staticmethod
+    def _tf_panel(buf: SeriesBuffer, start: int, end: int, count: int, minutes: int) -> BarPanel:
+        # reshape the tail into (candles, minutes) and reduce every candle at once
+        block = buf.data[:, start:end].reshape(len(buf.data), count, minutes)
+        return BarPanel(
+            o=block[OPEN, :, 0],
+            h=block[HIGH].max(axis=1),
+            l=block[LOW].min(axis=1),
+            c=block[CLOSE, :, -1],
+            v=block[VOLUME].sum(axis=1)
+        )
 
     # convenience helpers
     def get_latest_5m(self, inst_key: str) -> Optional[dict]:
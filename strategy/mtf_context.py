@@ -1,7 +1,9 @@
 # strategy/mtf_context.py
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from strategy.direction import Direction
 
 
 # =========================
@@ -15,35 +17,36 @@ class MTFContext:
     confidence: str       # HIGH / MEDIUM / LOW
     conflict: bool        # True if 5m & 15m disagree
     comment: str
+    code: Direction = Direction.NEUTRAL   # int form of `direction`
 
 
 # =========================
 # Candle Helpers
 # =========================
 
-def _is_bullish(candle: dict) -> bool:
-    return candle and candle.get("close", 0) > candle.get("open", 0)
-
-
-def _is_bearish(candle: dict) -> bool:
-    return candle and candle.get("close", 0) < candle.get("open", 0)
+def _candle_sign(candle: Optional[dict]) -> int:
+    """+1 bullish, -1 bearish, 0 doji / missing candle."""
+    if not candle:
+        return 0
+    close = candle.get("close", 0)
+    open_ = candle.get("open", 0)
+    return 1 if close > open_ else -1 if close < open_ else 0
 
 
 # =========================
 # Persistence Logic
 # =========================
 
-def _persistence_score(history: List[dict]) -> float:
+def _persistence_score(signs: Tuple[int, ...]) -> float:
     """
-    Persistence bonus based on last 3 candles.
+    Persistence bonus based on the signs of the last 3 candles.
     Returns 0.0 / 0.3 / 0.6
     """
-    if not history or len(history) < 2:
+    if len(signs) < 2:
         return 0.0
 
-    last = history[-3:]
-    bull = sum(1 for c in last if _is_bullish(c))
-    bear = sum(1 for c in last if _is_bearish(c))
+    bull = signs.count(1)
+    bear = signs.count(-1)
 
     if bull == 3 or bear == 3:
         return 0.6
@@ -56,6 +59,13 @@ def _persistence_score(history: List[dict]) -> float:
 # Main Analyzer
 # =========================
 
+_DIRECTION_NAMES = {
+    Direction.BEARISH: "BEARISH",
+    Direction.NEUTRAL: "NEUTRAL",
+    Direction.BULLISH: "BULLISH",
+}
+
+
 def analyze_mtf(
     candle_5m: Optional[dict],
     candle_15m: Optional[dict],
@@ -77,49 +87,49 @@ def analyze_mtf(
     comments = []
     conflict = False
 
+    # candle signs, computed once: +1 bullish / -1 bearish / 0
+    sign5 = _candle_sign(candle_5m)
+    sign15 = _candle_sign(candle_15m)
+
     # ---------------------
     # Base Direction Votes
     # ---------------------
 
-    if candle_5m:
-        if _is_bullish(candle_5m):
-            score += 0.7
-            comments.append("5m bullish")
-        elif _is_bearish(candle_5m):
-            score -= 0.7
-            comments.append("5m bearish")
-
-    if candle_15m:
-        if _is_bullish(candle_15m):
-            score += 1.3   # 15m has more authority
-            comments.append("15m bullish")
-        elif _is_bearish(candle_15m):
-            score -= 1.3
-            comments.append("15m bearish")
+    if sign5 > 0:
+        score += 0.7
+        comments.append("5m bullish")
+    elif sign5 < 0:
+        score -= 0.7
+        comments.append("5m bearish")
+
+    if sign15 > 0:
+        score += 1.3   # 15m has more authority
+        comments.append("15m bullish")
+    elif sign15 < 0:
+        score -= 1.3
+        comments.append("15m bearish")
 
     # ---------------------
     # Conflict Detection
     # ---------------------
 
-    if candle_5m and candle_15m:
-        if (_is_bullish(candle_5m) and _is_bearish(candle_15m)) or \
-           (_is_bearish(candle_5m) and _is_bullish(candle_15m)):
-            conflict = True
-            score *= 0.5   # dampen conviction heavily
-            comments.append("5m/15m conflict")
+    if sign5 * sign15 < 0:
+        conflict = True
+        score *= 0.5   # dampen conviction heavily
+        comments.append("5m/15m conflict")
 
     # ---------------------
     # Persistence Bonus
     # ---------------------
 
     if history_5m:
-        p5 = _persistence_score(history_5m)
+        p5 = _persistence_score(tuple(_candle_sign(c) for c in history_5m[-3:]))
         if p5:
             score += p5
             comments.append(f"5m persistence +{p5}")
 
     if history_15m:
-        p15 = _persistence_score(history_15m)
+        p15 = _persistence_score(tuple(_candle_sign(c) for c in history_15m[-3:]))
         if p15:
             score += p15
             comments.append(f"15m persistence +{p15}")
@@ -129,11 +139,11 @@ def analyze_mtf(
     # ---------------------
 
     if abs(score) < 0.4:
-        direction = "NEUTRAL"
+        code = Direction.NEUTRAL
     elif score > 0:
-        direction = "BULLISH"
+        code = Direction.BULLISH
     else:
-        direction = "BEARISH"
+        code = Direction.BEARISH
 
     strength = round(min(abs(score), 2.0), 2)
 
@@ -151,9 +161,10 @@ def analyze_mtf(
     comment = " | ".join(comments) if comments else "No HTF structure"
 
     return MTFContext(
-        direction=direction,
+        direction=_DIRECTION_NAMES[code],
         strength=strength,
         confidence=confidence,
         conflict=conflict,
-        comment=comment
+        comment=comment,
+        code=code
     )
@@ -15,50 +15,36 @@ Functions:
 Design: conservative, additive (soft), and safe for intraday.
 """
 
-from typing import List, Optional, Dict
+from typing import Optional, Dict, Sequence, Tuple
 
+import numpy as np
 
-def _safe_last(seq: List[float], idx: int = -1) -> Optional[float]:
-    try:
-        return seq[idx]
-    except Exception:
-        return None
+# bars forming the pullback swing (before the last one); MarketScanner tracks
+# this window for recent_high / recent_low
+PULLBACK_LOOKBACK = 6
 
 
-def detect_pullback_in_trend(
-    prices: List[float],
-    ema_short: Optional[float] = None,
-    ema_long: Optional[float] = None,
-    lookback: int = 6,
-    max_depth_pct: float = 0.006
-) -> Optional[Dict]:
-    """
-    Detects a shallow pullback inside a trend.
-    - prices: list of closes (oldest->newest)
-    - ema_short / ema_long: optional numeric EMAs (most recent values) to determine trend direction
-    - lookback: number of bars used to define local swing (default 6)
-    - max_depth_pct: maximum pullback depth (fraction) to still call it a 'safe' pullback
+def _is_empty(seq) -> bool:
+    # works for lists and NumPy arrays (arrays have no truth value)
+    return seq is None or len(seq) == 0
 
-    Returns dict:
-      { "type": "PULLBACK_UP"|"PULLBACK_DOWN"|None,
-        "depth": float (0..1) }
-    or None if not enough data.
-    """
-    if not prices or len(prices) < lookback + 1:
-        return None
 
-    last = prices[-1]
-    window = prices[-(lookback + 1):-1]  # exclude last bar when computing recent swing
-    if not window:
-        return None
+def _extrema(window) -> Tuple[float, float]:
+    # ndarray views reduce in C; plain lists keep the builtins
+    if isinstance(window, np.ndarray):
+        return float(window.max()), float(window.min())
+    return float(max(window)), float(min(window))
 
-    recent_high = max(window)
-    recent_low = min(window)
-
-    # compute depth relative to immediate recent swing
-    if recent_high <= 0 or recent_low <= 0:
-        return None
 
+def _classify_pullback(
+    last: float,
+    recent_high: float,
+    recent_low: float,
+    ema_short: Optional[float],
+    ema_long: Optional[float],
+    max_depth_pct: float
+) -> Optional[Dict]:
+    # shared by detect_pullback_in_trend and the fused price_action_context path
     pullback_up = (recent_high - last) / recent_high  # positive if price pulled back from high
     pullback_down = (last - recent_low) / recent_low  # positive if price rebounded from low
 
@@ -72,20 +58,60 @@ def detect_pullback_in_trend(
 
     # Accept only shallow pullbacks inside the matching trend
     if trend == "UP" and 0 < pullback_up <= max_depth_pct:
-        return {"type": "PULLBACK_UP", "depth": round(pullback_up, 6)}
+        return {"type": "PULLBACK_UP", "depth": pullback_up}
     if trend == "DOWN" and 0 < pullback_down <= max_depth_pct:
-        return {"type": "PULLBACK_DOWN", "depth": round(pullback_down, 6)}
+        return {"type": "PULLBACK_DOWN", "depth": pullback_down}
 
     # If trend unknown, allow a looser check (but be conservative)
     if trend is None:
         if 0 < pullback_up <= max_depth_pct * 0.8:
-            return {"type": "PULLBACK_UP", "depth": round(pullback_up, 6)}
+            return {"type": "PULLBACK_UP", "depth": pullback_up}
         if 0 < pullback_down <= max_depth_pct * 0.8:
-            return {"type": "PULLBACK_DOWN", "depth": round(pullback_down, 6)}
+            return {"type": "PULLBACK_DOWN", "depth": pullback_down}
 
     return None
 
 
+def detect_pullback_in_trend(
+    prices: Sequence[float],
+    ema_short: Optional[float] = None,
+    ema_long: Optional[float] = None,
+    lookback: int = PULLBACK_LOOKBACK,
+    max_depth_pct: float = 0.006,
+    recent_high: Optional[float] = None,
+    recent_low: Optional[float] = None
+) -> Optional[Dict]:
+    """
+    Detects a shallow pullback inside a trend.
+    - prices: list or float64 array of closes (oldest->newest)
+    - ema_short / ema_long: optional numeric EMAs (most recent values) to determine trend direction
+    - lookback: number of bars used to define local swing (default 6)
+    - max_depth_pct: maximum pullback depth (fraction) to still call it a 'safe' pullback
+    - recent_high / recent_low: precomputed swing extrema of the `lookback` closes
+      before the last one (MarketScanner.recent_high/recent_low); skips the window scan
+
+    Returns dict:
+      { "type": "PULLBACK_UP"|"PULLBACK_DOWN"|None,
+        "depth": float (0..1, unrounded) }
+    or None if not enough data.
+    """
+    if prices is None or len(prices) < lookback + 1:
+        return None
+
+    last = float(prices[-1])
+    if recent_high is None or recent_low is None:
+        window = prices[-(lookback + 1):-1]  # exclude last bar when computing recent swing
+        if len(window) == 0:
+            return None
+        recent_high, recent_low = _extrema(window)
+
+    # compute depth relative to immediate recent swing
+    if recent_high <= 0 or recent_low <= 0:
+        return None
+
+    return _classify_pullback(last, recent_high, recent_low, ema_short, ema_long, max_depth_pct)
+
+
 def rejection_info(open_p: float, high: float, low: float, close: float) -> Dict:
     """
     Quantifies rejection wicks for the last bar.
@@ -94,6 +120,8 @@ def rejection_info(open_p: float, high: float, low: float, close: float) -> Dict
         "rejection_score": 0.0..1.0,
         "upper_wick": float,
         "lower_wick": float }
+    Only rejection_score is rounded (it feeds scoring); wick/body/range are
+    raw floats.
     Logic:
       - Compute upper and lower wick sizes relative to bar range.
       - If one wick >> body, it's a rejection in opposite direction of the wick.
@@ -131,23 +159,28 @@ def rejection_info(open_p: float, high: float, low: float, close: float) -> Dict
     return {
         "rejection_type": rejection_type,
         "rejection_score": round(rejection_score, 3),
-        "upper_wick": round(upper_wick, 6),
-        "lower_wick": round(lower_wick, 6),
-        "body": round(body, 6),
-        "range": round(total_range, 6)
+        "upper_wick": upper_wick,
+        "lower_wick": lower_wick,
+        "body": body,
+        "range": total_range
     }
 
 
 def price_action_context(
-    prices: List[float],
-    highs: List[float],
-    lows: List[float],
-    opens: List[float],
-    closes: List[float],
+    prices: Sequence[float],
+    highs: Sequence[float],
+    lows: Sequence[float],
+    opens: Sequence[float],
+    closes: Sequence[float],
     ema_short: Optional[float] = None,
-    ema_long: Optional[float] = None
+    ema_long: Optional[float] = None,
+    recent_high: Optional[float] = None,
+    recent_low: Optional[float] = None
 ) -> Dict:
     """
+    recent_high / recent_low are optional precomputed pullback swing
+    extrema, as in detect_pullback_in_trend.
+
     Returns a combined price-action context:
       {
         "pullback": "PULLBACK_UP"/"PULLBACK_DOWN"/None,
@@ -173,22 +206,24 @@ def price_action_context(
     }
 
     # Basic safety
-    if not prices or not highs or not lows or not closes or len(prices) < 6:
+    if _is_empty(highs) or _is_empty(lows) or _is_empty(closes) or _is_empty(prices) or len(prices) < 6:
         result["comment"] = "insufficient data"
         return result
 
-    # pullback detection (prefer closes list)
-    pb = detect_pullback_in_trend(prices, ema_short=ema_short, ema_long=ema_long)
-    if pb:
-        result["pullback"] = pb["type"]
-        result["pullback_depth"] = pb["depth"]
+    # one tail slice feeds the pullback swing (same lookback as
+    # detect_pullback_in_trend); the last bars feed the rejection check
+    last_price = float(prices[-1])
+    if len(prices) > PULLBACK_LOOKBACK:
+        if recent_high is None or recent_low is None:
+            recent_high, recent_low = _extrema(prices[-(PULLBACK_LOOKBACK + 1):-1])
+        if recent_high > 0 and recent_low > 0:
+            pb = _classify_pullback(last_price, recent_high, recent_low, ema_short, ema_long, 0.006)
+            if pb:
+                result["pullback"] = pb["type"]
+                result["pullback_depth"] = pb["depth"]
 
     # rejection on last bar
-    last_open = opens[-1]
-    last_high = highs[-1]
-    last_low = lows[-1]
-    last_close = closes[-1]
-    rej = rejection_info(last_open, last_high, last_low, last_close)
+    rej = rejection_info(float(opens[-1]), float(highs[-1]), float(lows[-1]), float(closes[-1]))
     result["rejection_type"] = rej["rejection_type"]
     result["rejection_score"] = rej["rejection_score"]
 
@@ -240,4 +275,3 @@ def price_action_context(
     result["score"] = round(score, 3)
     result["comment"] = " | ".join(comments) if comments else "no_pa"
     return result
-    
@@ -1,18 +1,31 @@
 # strategy/pullback_detector.py
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Sequence
+
 from strategy.sr_levels import compute_sr_levels, get_nearest_sr
-from strategy.price_action import rejection_info
+from strategy._pullback_kernel import rejection_code, REJECTION_BULLISH, REJECTION_BEARISH
+
+# (SR level type, HTF direction) -> trade direction; other pairs are no setup
+_SETUP_DIRECTION = {
+    ("support", "BULLISH"): "LONG",
+    ("resistance", "BEARISH"): "SHORT",
+}
+# rejection code that vetoes a setup in each direction
+_OPPOSING_REJECTION = {
+    "LONG": REJECTION_BEARISH,
+    "SHORT": REJECTION_BULLISH,
+}
 
 
 def detect_pullback_signal(
-    prices: List[float],
+    prices: Sequence[float],
     highs: List[float],
     lows: List[float],
-    closes: List[float],
+    closes: Sequence[float],
     htf_direction: str,
     max_proximity: float = 0.02,
-    min_bars: int = 30
+    min_bars: int = 30,
+    sr_levels: Optional[Dict] = None
 ) -> Optional[Dict]:
     """
     CLEAN PULLBACK SETUP DETECTOR
@@ -22,6 +35,9 @@ def detect_pullback_signal(
     - NO scoring, NO filtering
     - Only structure detection
 
+    sr_levels: precomputed compute_sr_levels() output; callers that
+    cache levels per bar pass it to skip the recomputation.
+
     Output:
     {
         "direction": "LONG" / "SHORT",
@@ -33,13 +49,13 @@ def detect_pullback_signal(
     if len(prices) < min_bars:
         return None
 
-    last_price = closes[-1]
+    last_price = float(closes[-1])
 
     # ----------------------
     # 1️⃣ STRUCTURE (SR LEVEL)
     # ----------------------
 
-    sr = compute_sr_levels(highs, lows)
+    sr = sr_levels if sr_levels is not None else compute_sr_levels(highs, lows)
     nearest = get_nearest_sr(last_price, sr, max_search_pct=max_proximity)
 
     if not nearest:
@@ -49,33 +65,25 @@ def detect_pullback_signal(
     # 2️⃣ DIRECTION ALIGNMENT
     # ----------------------
 
-    direction = None
-
-    if nearest["type"] == "support" and htf_direction == "BULLISH":
-        direction = "LONG"
-
-    elif nearest["type"] == "resistance" and htf_direction == "BEARISH":
-        direction = "SHORT"
-
-    else:
+    direction = _SETUP_DIRECTION.get((nearest["type"], htf_direction))
+    if direction is None:
         return None
 
     # ----------------------
     # 3️⃣ SIMPLE PRICE REACTION (OPTIONAL)
     # ----------------------
 
-    last_rejection = rejection_info(
-        closes[-2],
-        highs[-1],
-        lows[-1],
-        closes[-1]
+    # only the rejection direction is used here, so skip rejection_info's
+    # full dict and take the int code from the kernel
+    rejection = rejection_code(
+        float(closes[-2]),
+        float(highs[-1]),
+        float(lows[-1]),
+        last_price
     )
 
-    # Optional light filter (not strict)
-    if direction == "LONG" and last_rejection["rejection_type"] == "BEARISH":
-        return None
-
-    if direction == "SHORT" and last_rejection["rejection_type"] == "BULLISH":
+    # Optional light filter (not strict): drop setups rejected the other way
+    if rejection == _OPPOSING_REJECTION[direction]:
         return None
 
     # ----------------------
@@ -5,20 +5,38 @@ Hardened MarketScanner (production-ready).
 - supports tick aggregation, direct OHLC bar ingestion (append_ohlc_bar)
 - snapshot persistence and resume
 - on_bar_close callbacks so MTF/strategy can run immediately when a bar closes
-- alert throttling helpers (last_alert_time, dedupe)
+- alert throttling helpers (alert state, dedupe)
 - basic health checks and replay utilities
 - thread-safe for use from websocket threads
+- columnar NumPy mirror of the numeric fields for zero-copy series views
 """
 
 import json
 import os
 import threading
 import time
+import uuid
 from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Callable, Optional
+from itertools import islice
+from typing import Dict, List, Callable, Optional, Tuple
+
+import numpy as np
+
+from strategy.bar_panel import BarPanel, EMPTY_PANEL
+from strategy.series_buffer import (
+    SERIES_FIELDS, SeriesBuffer,
+    OPEN as _OPEN, HIGH as _HIGH, LOW as _LOW, CLOSE as _CLOSE, VOLUME as _VOLUME
+)
 
 DEFAULT_MAX_LEN = 600  # keep 600 1-minute bars (~10 hours)
+DEFAULT_ATR_PERIOD = 14
+DEFAULT_BREAKOUT_LOOKBACK = 2  # settled closes forming the breakout base
+DEFAULT_SWING_WINDOWS = (6,)  # price_action pullback swing lookback
+LOCK_STRIPES = 64  # power of two, see MarketScanner._lock_for
+SNAPSHOT_FORMAT = 2  # JSON metadata + .npz bar arrays (1: bars inline in JSON)
+_NO_ALERT_STATE = (None, None)  # (last alert ts, paused until ts)
 
 ISOFMT = "%Y-%m-%dT%H:%M:%S"  # simple ISO without tz
 
@@ -27,26 +45,104 @@ def _now_iso():
     return datetime.now().strftime(ISOFMT)
 
 
+_EMPTY_SERIES = np.empty(0, dtype=np.float64)
+_EMPTY_SERIES.flags.writeable = False
+
+
+class _RollingExtrema:
+    """
+    Sliding-window max/min over the last `window` pushed values.
+    Monotonic deques of (index, value): O(1) amortised per push and per read.
+    """
+
+    __slots__ = ("window", "count", "_max", "_min")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self._max: deque = deque()
+        self._min: deque = deque()
+
+    def push(self, value: float):
+        i = self.count
+        self.count += 1
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((i, value))
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((i, value))
+
+        stale = i - self.window
+        if self._max[0][0] <= stale:
+            self._max.popleft()
+        if self._min[0][0] <= stale:
+            self._min.popleft()
+
+    def is_full(self) -> bool:
+        return self.count >= self.window
+
+    def high(self) -> float:
+        return self._max[0][1]
+
+    def low(self) -> float:
+        return self._min[0][1]
+
+
 class MarketScanner:
-    def __init__(self, max_len: int = DEFAULT_MAX_LEN, snapshot_path: Optional[str] = None):
+    def __init__(
+        self,
+        max_len: int = DEFAULT_MAX_LEN,
+        snapshot_path: Optional[str] = None,
+        atr_period: int = DEFAULT_ATR_PERIOD,
+        breakout_lookback: int = DEFAULT_BREAKOUT_LOOKBACK,
+        swing_windows=DEFAULT_SWING_WINDOWS,
+        callback_workers: int = 0
+    ):
         self.max_len = max_len
         self.snapshot_path = snapshot_path
+        self.atr_period = atr_period
+        self.breakout_lookback = breakout_lookback
+        # close windows tracked for recent_high/recent_low (breakout base included)
+        self.swing_windows = tuple(sorted({breakout_lookback, *swing_windows}))
 
         # core storage: per-symbol deque of bar dicts
         # bar dict: {"time": "YYYY-MM-DDTHH:MM:SS", "open":, "high":, "low":, "close":, "volume":}
         self._bars: Dict[str, deque] = {}
-        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        # columnar mirror of self._bars (numeric fields only), see SeriesBuffer
+        self._series: Dict[str, SeriesBuffer] = {}
+
+        # incremental indicator state, advanced once per new bar.
+        # the newest bar may still be updated by ticks, so only bars before it
+        # are "settled"; accessors combine settled state with the newest bar.
+        self._tr_settled: Dict[str, deque] = {}
+        self._close_range: Dict[str, Dict[int, _RollingExtrema]] = {}
+        # bumped whenever a new bar is opened; lets callers cache per-bar work
+        self._bar_version: Dict[str, int] = {}
+        # inst -> (wall-clock minute index, its ISOFMT string) for append_tick
+        self._tick_minute: Dict[str, tuple] = {}
+        # striped per-instrument locks: fixed array, no per-symbol allocation.
+        # RLocks, since instruments sharing a stripe may be touched from
+        # callbacks that run under another instrument's lock (replay_bars)
+        self._stripes = [threading.RLock() for _ in range(LOCK_STRIPES)]
         self._global_lock = threading.Lock()
 
         # quick-access caches (kept in sync) to preserve compatibility with your old getters
         # These will be derived from self._bars on request to avoid duplication.
-        # last_alert_time and dedupe state
-        self.last_alert_time: Dict[str, float] = {}
+        # alert state and dedupe state
+        # inst -> (last alert epoch ts, paused-until epoch ts); one lookup per can_emit_alert
+        self._alert_state: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
         self._dedupe_map: Dict[str, Dict[str, float]] = defaultdict(dict)  # inst -> {direction: ts}
-        self._paused_until: Dict[str, float] = {}  # inst -> timestamp (epoch) until which instrument is paused
 
         # callbacks that are called when a 1-minute bar is appended / closed
         self._on_bar_close_callbacks: List[Callable[[str, dict], None]] = []
+        # immutable snapshot iterated per bar; rebuilt on (un)register only
+        self._callbacks: tuple = ()
+        # callback_workers > 0: run callbacks on a thread pool so a slow one
+        # doesn't hold up the feed thread (callbacks must be thread-safe)
+        self._callback_pool = ThreadPoolExecutor(max_workers=callback_workers) if callback_workers > 0 else None
 
         # metrics
         self.bars_received = 0
@@ -61,13 +157,37 @@ class MarketScanner:
     # Internal helpers
     # ---------------------
     def _ensure_inst(self, inst: str):
+        if inst in self._bars:
+            return
         with self._global_lock:
             if inst not in self._bars:
+                # series state first: the unlocked check above keys off _bars
+                self._reset_series(inst)
                 self._bars[inst] = deque(maxlen=self.max_len)
 
     def _lock_for(self, inst: str):
-        # simple per-instrument lock object
-        return self._locks[inst]
+        return self._stripes[hash(inst) & (LOCK_STRIPES - 1)]
+
+    def _reset_series(self, inst: str):
+        self._series[inst] = SeriesBuffer(self.max_len)
+        self._tr_settled[inst] = deque(maxlen=self.atr_period - 1)
+        self._close_range[inst] = {w: _RollingExtrema(w) for w in self.swing_windows}
+
+    def _push_series(self, inst: str, bar: dict):
+        """
+        Append a new bar to the columnar mirror and settle the previous one.
+        Caller holds the instrument lock.
+        """
+        series = self._series[inst]
+        series.append(bar)
+        self._bar_version[inst] = self._bar_version.get(inst, 0) + 1
+        n = len(series)
+        if n >= 2:
+            settled_close = float(series.data[_CLOSE, series.end - 2])
+            for ext in self._close_range[inst].values():
+                ext.push(settled_close)
+        if n >= 3:
+            self._tr_settled[inst].append(series.true_range(back=2))
 
     # ---------------------
     # Append / ingestion
@@ -97,15 +217,11 @@ class MarketScanner:
                 "volume": volume
             }
             self._bars[inst].append(bar)
+            self._push_series(inst, bar)
             self.bars_closed += 1
 
         # call callbacks outside lock to avoid deadlocks
-        for cb in list(self._on_bar_close_callbacks):
-            try:
-                cb(inst, bar)
-            except Exception:
-                # callbacks should be robust; do not raise
-                pass
+        self._dispatch_bar_close(inst, bar)
 
         return bar
 
@@ -116,8 +232,15 @@ class MarketScanner:
         If you already receive 1-minute OHLC, prefer append_ohlc_bar.
         """
         self._ensure_inst(inst)
-        ts_min = timestamp.replace(second=0, microsecond=0)
-        time_iso = ts_min.strftime(ISOFMT)
+        # wall-clock minute as an int (ISOFMT drops tz too); the ISO string
+        # is only formatted when the minute changes, not on every tick
+        minute = timestamp.toordinal() * 1440 + timestamp.hour * 60 + timestamp.minute
+        cached = self._tick_minute.get(inst)
+        if cached is not None and cached[0] == minute:
+            time_iso = cached[1]
+        else:
+            time_iso = timestamp.replace(second=0, microsecond=0).strftime(ISOFMT)
+            self._tick_minute[inst] = (minute, time_iso)
 
         with self._lock_for(inst):
             bars = self._bars[inst]
@@ -125,6 +248,7 @@ class MarketScanner:
                 # start a new bar
                 bar = {"time": time_iso, "open": price, "high": price, "low": price, "close": price, "volume": volume}
                 bars.append(bar)
+                self._push_series(inst, bar)
                 self.bars_received += 1
                 # We do NOT trigger callbacks on first tick of bar; only when the bar is closed via append_ohlc_bar
             else:
@@ -134,6 +258,7 @@ class MarketScanner:
                 bar["low"] = min(bar["low"], price)
                 bar["close"] = price
                 bar["volume"] = bar.get("volume", 0) + volume
+                self._series[inst].set_last(bar)
                 self.bars_received += 1
 
     def update(
@@ -144,18 +269,20 @@ class MarketScanner:
         low: float,
         close: float,
         volume: float,
-        time_iso: Optional[str] = None
+        time_iso: Optional[str] = None,
+        now: Optional[datetime] = None
     ):
         """
         Backwards-compatible method matching your old interface.
         Treat this as a direct append of a 1-minute bar when time_iso provided,
-        otherwise treat as a tick aggregator using current time.
+        otherwise treat as a tick aggregator using `now` (or the current time).
+        Batch callers pass one shared `now` instead of a clock read per tick.
         """
         if time_iso:
             self.append_ohlc_bar(instrument, time_iso, price, high, low, close, volume)
         else:
             # if no timestamp passed, assume current minute
-            self.append_tick(instrument, datetime.now(), price, volume)
+            self.append_tick(instrument, now or datetime.now(), price, volume)
 
     # ---------------------
     # Accessors & getters
@@ -167,8 +294,16 @@ class MarketScanner:
         if inst not in self._bars:
             return []
         with self._lock_for(inst):
-            bars = list(self._bars[inst])[-n:]
-            return bars
+            bars = self._bars[inst]
+            if 0 < n < len(bars):
+                # index from the right end instead of copying the whole
+                # deque (the strategy loop asks for n=1 on every tick)
+                return [bars[-i] for i in range(n, 0, -1)]
+            if n >= 0:
+                # whole window (n == 0 keeps the old list[-0:] behaviour)
+                return list(bars)
+            # negative n: same as list(bars)[-n:], without the full copy
+            return list(islice(bars, -n, None))
 
     def get_last_bar(self, inst: str) -> Optional[dict]:
         if inst not in self._bars or not self._bars[inst]:
@@ -176,27 +311,148 @@ class MarketScanner:
         with self._lock_for(inst):
             return dict(self._bars[inst][-1])
 
+    # list getters kept for backward compatibility; they copy out of the
+    # columnar buffer (floats) rather than walking the bar dicts
+    def _series_list(self, inst: str, field: int, n: Optional[int] = None) -> List[float]:
+        buf = self._series.get(inst)
+        if buf is None:
+            return []
+        with self._lock_for(inst):
+            view = buf.view(field)
+            if n is not None:
+                view = view[-n:]  # same slice get_last_n_bars applies
+            return view.tolist()
+
     def get_prices(self, inst: str) -> List[float]:
-        return [b["close"] for b in self.get_last_n_bars(inst, self.max_len)]
+        return self._series_list(inst, _CLOSE)
 
     def get_highs(self, inst: str) -> List[float]:
-        return [b["high"] for b in self.get_last_n_bars(inst, self.max_len)]
+        return self._series_list(inst, _HIGH)
 
     def get_lows(self, inst: str) -> List[float]:
-        return [b["low"] for b in self.get_last_n_bars(inst, self.max_len)]
+        return self._series_list(inst, _LOW)
 
     def get_closes(self, inst: str) -> List[float]:
-        return [b["close"] for b in self.get_last_n_bars(inst, self.max_len)]
+        return self._series_list(inst, _CLOSE)
 
     def get_volumes(self, inst: str) -> List[float]:
-        return [b["volume"] for b in self.get_last_n_bars(inst, self.max_len)]
+        return self._series_list(inst, _VOLUME)
 
     def get_last_n_closes(self, inst: str, n: int) -> List[float]:
-        return [b["close"] for b in self.get_last_n_bars(inst, n)]
+        return self._series_list(inst, _CLOSE, n)
+
+    # ---------------------
+    # Zero-copy series views (oldest -> newest)
+    # Views alias the live buffer: the newest element follows in-progress
+    # tick updates, so read them right away instead of holding on to them.
+    # ---------------------
+    def _series_view(self, inst: str, field: int, start=None, stop=None) -> np.ndarray:
+        buf = self._series.get(inst)
+        if buf is None:
+            return _EMPTY_SERIES
+        view = buf.view(field)
+        if start is None and stop is None:
+            return view
+        return view[start:stop]
+
+    # start / stop slice the retained window like a list (negative indices
+    # count from the newest bar), still without copying
+    def opens_view(self, inst: str, start=None, stop=None) -> np.ndarray:
+        return self._series_view(inst, _OPEN, start, stop)
+
+    def highs_view(self, inst: str, start=None, stop=None) -> np.ndarray:
+        return self._series_view(inst, _HIGH, start, stop)
+
+    def lows_view(self, inst: str, start=None, stop=None) -> np.ndarray:
+        return self._series_view(inst, _LOW, start, stop)
+
+    def closes_view(self, inst: str, start=None, stop=None) -> np.ndarray:
+        return self._series_view(inst, _CLOSE, start, stop)
+
+    def volumes_view(self, inst: str, start=None, stop=None) -> np.ndarray:
+        return self._series_view(inst, _VOLUME, start, stop)
+
+    def panel(self, inst: str) -> BarPanel:
+        """All five series views bundled as one BarPanel (still zero-copy)."""
+        buf = self._series.get(inst)
+        if buf is None:
+            return EMPTY_PANEL
+        return BarPanel(
+            o=buf.view(_OPEN),
+            h=buf.view(_HIGH),
+            l=buf.view(_LOW),
+            c=buf.view(_CLOSE),
+            v=buf.view(_VOLUME)
+        )
+
+    # ---------------------
+    # Incremental indicators
+    # ---------------------
+    def atr(self, inst: str) -> Optional[float]:
+        """
+        ATR (mean of the last `atr_period` true ranges) in O(period).
+        Same value as compute_atr(highs, lows, closes, atr_period) over the
+        retained bars, without rebuilding TR for the whole history.
+        """
+        series = self._series.get(inst)
+        if series is None or len(series) < self.atr_period + 1:
+            return None
+        with self._lock_for(inst):
+            return (sum(self._tr_settled[inst]) + series.true_range(back=1)) / self.atr_period
+
+    def recent_high(self, inst: str, n: int) -> Optional[float]:
+        """
+        Highest close of the n bars before the newest one (same as
+        max(closes[-n-1:-1])) in O(1). Only windows in `swing_windows` (plus
+        the breakout lookback) are tracked; others return None, as does any
+        window until enough bars exist.
+        """
+        ext = self._close_range.get(inst, {}).get(n)
+        if ext is None or not ext.is_full():
+            return None
+        with self._lock_for(inst):
+            return ext.high()
+
+    def recent_low(self, inst: str, n: int) -> Optional[float]:
+        """Lowest close of the n bars before the newest one, see recent_high."""
+        ext = self._close_range.get(inst, {}).get(n)
+        if ext is None or not ext.is_full():
+            return None
+        with self._lock_for(inst):
+            return ext.low()
+
+    def range_high(self, inst: str) -> Optional[float]:
+        """Breakout base high: recent_high over `breakout_lookback` closes."""
+        return self.recent_high(inst, self.breakout_lookback)
+
+    def range_low(self, inst: str) -> Optional[float]:
+        """Breakout base low: recent_low over `breakout_lookback` closes."""
+        return self.recent_low(inst, self.breakout_lookback)
+
+    def bar_version(self, inst: str) -> int:
+        """
+        Monotonic per-instrument counter, incremented each time a new bar is
+        opened (not on in-progress tick updates). Use it as a cache key for
+        work that only changes bar to bar.
+        """
+        return self._bar_version.get(inst, 0)
 
     def has_enough_data(self, inst: str, min_bars: int = 30) -> bool:
         return (inst in self._bars and len(self._bars[inst]) >= min_bars)
 
+    def bar_counts(self, insts: List[str]) -> np.ndarray:
+        """
+        Closed + in-progress bar count per instrument, in `insts` order
+        (0 for unknown instruments). One array for a whole tick batch, so
+        callers can gate on data sufficiency with a single comparison.
+        """
+        bars = self._bars
+        return np.fromiter(
+            (len(bars[i]) if i in bars else 0 for i in insts),
+            dtype=np.int64,
+            count=len(insts),
+        )
+
     def active_instruments(self) -> List[str]:
         return list(self._bars.keys())
 
@@ -210,10 +466,28 @@ class MarketScanner:
         """
         if cb not in self._on_bar_close_callbacks:
             self._on_bar_close_callbacks.append(cb)
+            self._callbacks = tuple(self._on_bar_close_callbacks)
 
     def unregister_on_bar_close(self, cb: Callable[[str, dict], None]):
         if cb in self._on_bar_close_callbacks:
             self._on_bar_close_callbacks.remove(cb)
+            self._callbacks = tuple(self._on_bar_close_callbacks)
+
+    @staticmethod
+    def _run_callback(cb: Callable[[str, dict], None], inst: str, bar: dict):
+        try:
+            cb(inst, bar)
+        except Exception as e:
+            # callbacks should be robust; do not raise, but don't hide it either
+            print(f"[MarketScanner] on_bar_close callback {getattr(cb, '__name__', cb)} failed for {inst}: {e}")
+
+    def _dispatch_bar_close(self, inst: str, bar: dict):
+        if self._callback_pool is None:
+            for cb in self._callbacks:
+                self._run_callback(cb, inst, bar)
+        else:
+            for cb in self._callbacks:
+                self._callback_pool.submit(self._run_callback, cb, inst, bar)
 
     # ---------------------
     # Alert throttling / dedupe helpers
@@ -222,18 +496,26 @@ class MarketScanner:
         """
         Return True if we are allowed to emit a new alert for `inst` (respect cooldown).
         """
+        last, paused_until = self._alert_state.get(inst, _NO_ALERT_STATE)
         now_ts = time.time()
-        paused_until = self._paused_until.get(inst)
         if paused_until and now_ts < paused_until:
             return False
 
-        last = self.last_alert_time.get(inst)
         if last is None:
             return True
         return (now_ts - last) >= cooldown_seconds
 
     def mark_alert_emitted(self, inst: str):
-        self.last_alert_time[inst] = time.time()
+        paused_until = self._alert_state.get(inst, _NO_ALERT_STATE)[1]
+        self._alert_state[inst] = (time.time(), paused_until)
+
+    @property
+    def last_alert_time(self) -> Dict[str, float]:
+        """inst -> last alert epoch ts (read-only copy of the alert state)."""
+        return {k: last for k, (last, _) in self._alert_state.items() if last is not None}
+
+    def _paused_until_map(self) -> Dict[str, float]:
+        return {k: until for k, (_, until) in self._alert_state.items() if until is not None}
 
     def dedupe_alert(self, inst: str, direction: str, window_seconds: int = 600) -> bool:
         """
@@ -252,7 +534,8 @@ class MarketScanner:
         """
         Pause instrument until epoch timestamp `until_ts`.
         """
-        self._paused_until[inst] = until_ts
+        last = self._alert_state.get(inst, _NO_ALERT_STATE)[0]
+        self._alert_state[inst] = (last, until_ts)
 
     # ---------------------
     # Persistence / snapshot
@@ -260,27 +543,87 @@ class MarketScanner:
     def save_snapshot(self, path: Optional[str] = None):
         """
         Save minimal scanner state: bars (last N), last_alert_time, dedupe timestamps, paused_until.
+
+        Bar values go to `<path>.npz` as one compressed (5, bars) float64
+        array per instrument (the columnar buffer); `path` itself is a small
+        JSON file with the metadata, instrument order and bar times. Both
+        files carry the same `stamp`, so a pair from different saves is
+        rejected on load.
         """
         path = path or self.snapshot_path
         if not path:
             raise ValueError("No snapshot path configured")
 
+        stamp = uuid.uuid4().hex
         data = {
-            "bars": {},
+            "format": SNAPSHOT_FORMAT,
+            "stamp": stamp,
+            "instruments": [],
+            "times": [],
+            "bars_received": self.bars_received,
+            "bars_closed": self.bars_closed,
             "last_alert_time": self.last_alert_time,
             "dedupe_map": self._dedupe_map,
-            "paused_until": self._paused_until,
+            "paused_until": self._paused_until_map(),
             "timestamp": _now_iso()
         }
+        arrays = []
 
         with self._global_lock:
-            for inst, dq in self._bars.items():
-                data["bars"][inst] = list(dq)
-
-        tmp = f"{path}.tmp"
-        with open(tmp, "w") as f:
+            items = list(self._bars.items())
+
+        # bars and series columns are copied under the instrument's own lock,
+        # the one append_tick mutates them under, so they stay in step
+        for inst, dq in items:
+            with self._lock_for(inst):
+                buf = self._series[inst]
+                times = [b["time"] for b in dq]
+                arrays.append(buf.data[:, buf.start:buf.end].copy())
+            data["instruments"].append(inst)
+            data["times"].append(times)
+
+        # write both files under temp names, then swap them in
+        arrays_path = f"{path}.npz"
+        arrays_tmp = f"{arrays_path}.tmp"
+        json_tmp = f"{path}.tmp"
+        with open(arrays_tmp, "wb") as f:
+            np.savez_compressed(f, *arrays, stamp=np.array(stamp))
+        with open(json_tmp, "w") as f:
             json.dump(data, f)
-        os.replace(tmp, path)
+        os.replace(arrays_tmp, arrays_path)
+        os.replace(json_tmp, path)
+
+    @staticmethod
+    def _snapshot_bars(data: dict, path: str) -> Optional[Dict[str, List[dict]]]:
+        """
+        Bar dicts per instrument from a loaded snapshot, or None if the
+        .npz is missing, belongs to another save, or disagrees with the
+        bar times in the JSON.
+        """
+        # legacy snapshots store the bar dicts inline
+        if "bars" in data:
+            return data["bars"]
+
+        arrays_path = f"{path}.npz"
+        if not os.path.exists(arrays_path):
+            return None
+
+        out = {}
+        with np.load(arrays_path) as arrays:
+            if "stamp" not in arrays.files or str(arrays["stamp"]) != data.get("stamp"):
+                return None
+            for i, (inst, times) in enumerate(zip(data["instruments"], data["times"])):
+                key = f"arr_{i}"
+                if key not in arrays.files:
+                    return None
+                cols = arrays[key]
+                if cols.shape != (len(SERIES_FIELDS), len(times)):
+                    return None
+                out[inst] = [
+                    dict(time=t, **dict(zip(SERIES_FIELDS, vals)))
+                    for t, *vals in zip(times, *cols.tolist())
+                ]
+        return out
 
     def load_snapshot(self, path: Optional[str] = None):
         path = path or self.snapshot_path
@@ -288,14 +631,28 @@ class MarketScanner:
             return False
         with open(path, "r") as f:
             data = json.load(f)
+        snapshot_bars = self._snapshot_bars(data, path)
+        if snapshot_bars is None:
+            print(f"[MarketScanner] Snapshot {path} has no matching bar arrays, ignored")
+            return False
 
         with self._global_lock:
-            for inst, bars in data.get("bars", {}).items():
-                dq = deque(bars, maxlen=self.max_len)
-                self._bars[inst] = dq
-            self.last_alert_time = data.get("last_alert_time", {})
+            for inst, bars in snapshot_bars.items():
+                with self._lock_for(inst):
+                    dq = deque(bars, maxlen=self.max_len)
+                    self._reset_series(inst)
+                    for bar in dq:
+                        self._push_series(inst, bar)
+                    self._bars[inst] = dq
+            last_alert_time = data.get("last_alert_time", {})
+            paused_until = data.get("paused_until", {})
+            self._alert_state = {
+                inst: (last_alert_time.get(inst), paused_until.get(inst))
+                for inst in {*last_alert_time, *paused_until}
+            }
             self._dedupe_map = defaultdict(dict, data.get("dedupe_map", {}))
-            self._paused_until = data.get("paused_until", {})
+            self.bars_received = data.get("bars_received", self.bars_received)
+            self.bars_closed = data.get("bars_closed", self.bars_closed)
 
         return True
 
@@ -314,13 +671,12 @@ class MarketScanner:
                 if not all(k in bar for k in ("time", "open", "high", "low", "close", "volume")):
                     continue
                 self._bars[inst].append(bar)
+                self._push_series(inst, bar)
                 self.bars_closed += 1
                 if call_callbacks:
-                    for cb in list(self._on_bar_close_callbacks):
-                        try:
-                            cb(inst, bar)
-                        except Exception:
-                            pass
+                    # replay stays serial so callbacks see bars in order
+                    for cb in self._callbacks:
+                        self._run_callback(cb, inst, bar)
         self.replay_mode = False
 
     def validate_bar_sequence(self, inst: str, max_gap_seconds: int = 90) -> List[dict]:
@@ -353,7 +709,8 @@ class MarketScanner:
         for k, dq in self._bars.items():
             if dq:
                 try:
-                    ts = datetime.strptime(dq[-1]["time"], ISOFMT)
+                    # ISOFMT is a subset of ISO 8601; fromisoformat is much cheaper
+                    ts = datetime.fromisoformat(dq[-1]["time"])
                     last_bar_diff[k] = (now_ts - ts).total_seconds()
                 except Exception:
                     last_bar_diff[k] = None
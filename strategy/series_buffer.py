@@ -0,0 +1,106 @@
+# strategy/series_buffer.py
+"""
+SeriesBuffer — columnar float64 buffer of the last N OHLCV bars of one
+instrument.
+
+Shared by MarketScanner (its per-instrument mirror of the bar deque) and
+MTFBuilder (its 1-minute store, with an int64 minute-index column).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+SERIES_FIELDS = ("open", "high", "low", "close", "volume")
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(SERIES_FIELDS))
+
+
+class SeriesBuffer:
+    """
+    Columnar float64 ring buffer holding the last `max_len` bars.
+
+    Storage is (fields, 2 * max_len). Bars are written left to right; when the
+    cursor reaches the end, the live tail is copied back to column 0. That keeps
+    the retained window one contiguous slice (views never need np.concatenate)
+    at an amortised O(1) cost per bar.
+
+    With timed=True an int64 column `t` runs alongside `data` and is
+    compacted with it.
+    """
+
+    __slots__ = ("data", "t", "start", "end", "max_len")
+
+    def __init__(self, max_len: int, timed: bool = False):
+        self.max_len = max_len
+        self.data = np.empty((len(SERIES_FIELDS), 2 * max_len), dtype=np.float64)
+        self.t: Optional[np.ndarray] = np.empty(2 * max_len, dtype=np.int64) if timed else None
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def _next_col(self) -> int:
+        """Column for a new bar, compacting first when the cursor is at the end."""
+        if self.end == self.data.shape[1]:
+            n = self.end - self.start
+            self.data[:, :n] = self.data[:, self.start:self.end]
+            if self.t is not None:
+                self.t[:n] = self.t[self.start:self.end]
+            self.start, self.end = 0, n
+        return self.end
+
+    def _advance(self):
+        self.end += 1
+        if self.end - self.start > self.max_len:
+            self.start += 1
+
+    def _write(self, col: int, bar: dict):
+        d = self.data
+        d[OPEN, col] = bar["open"]
+        d[HIGH, col] = bar["high"]
+        d[LOW, col] = bar["low"]
+        d[CLOSE, col] = bar["close"]
+        d[VOLUME, col] = bar.get("volume", 0)
+
+    def _write_row(self, col: int, o: float, h: float, l: float, c: float, v: float):
+        d = self.data
+        d[OPEN, col] = o
+        d[HIGH, col] = h
+        d[LOW, col] = l
+        d[CLOSE, col] = c
+        d[VOLUME, col] = v
+
+    def append(self, bar: dict):
+        self._write(self._next_col(), bar)
+        self._advance()
+
+    def append_row(self, o: float, h: float, l: float, c: float, v: float, t: int = 0):
+        """append() from scalars; `t` is stored when the buffer is timed."""
+        col = self._next_col()
+        self._write_row(col, o, h, l, c, v)
+        if self.t is not None:
+            self.t[col] = t
+        self._advance()
+
+    def set_last(self, bar: dict):
+        """Overwrite the newest bar (in-progress bar updated by ticks)."""
+        if self.end > self.start:
+            self._write(self.end - 1, bar)
+
+    def set_last_row(self, o: float, h: float, l: float, c: float, v: float):
+        """set_last() from scalars; the newest `t` is kept."""
+        if self.end > self.start:
+            self._write_row(self.end - 1, o, h, l, c, v)
+
+    def view(self, field: int) -> np.ndarray:
+        return self.data[field, self.start:self.end]
+
+    def true_range(self, back: int = 1) -> float:
+        """TR of the bar `back` positions from the newest (needs back + 1 bars)."""
+        d = self.data
+        col = self.end - back
+        high = d[HIGH, col]
+        low = d[LOW, col]
+        prev_close = d[CLOSE, col - 1]
+        return float(max(high - low, abs(high - prev_close), abs(low - prev_close)))
@@ -1,11 +1,17 @@
+import numpy as np
+
 from strategy.market_regime import detect_market_regime
 from strategy.htf_bias import get_htf_bias
 from strategy.pullback_detector import detect_pullback_signal
+from strategy.sr_levels import compute_sr_levels
 from strategy.decision_engine import final_trade_decision
+from strategy.price_action import PULLBACK_LOOKBACK
 
-from strategy.vwap_filter import VWAPCalculator
 from strategy.mtf_builder import MTFBuilder
 from strategy.mtf_context import analyze_mtf
+from strategy.direction import Direction
+
+MIN_BARS = 25
 
 
 class StrategyEngine:
@@ -13,57 +19,111 @@ class StrategyEngine:
     CLEAN PULLBACK STRATEGY ENGINE
 
     Flow:
-    MTF → HTF → VWAP → Pullback → Decision
+    Regime → MTF → HTF → VWAP → Pullback → Decision
+
+    VWAP is read from a VWAPBook; the feed loop updates the book for the
+    whole tick batch before evaluate() / evaluate_batch() runs.
     """
 
-    def __init__(self, scanner, vwap_calculators):
+    def __init__(self, scanner, vwap_book):
         self.scanner = scanner
-        self.vwap_calculators = vwap_calculators
+        self.vwap_book = vwap_book
         self.mtf_builder = MTFBuilder()
 
+        # inst_key -> (scanner bar version, SR levels); levels are rebuilt
+        # only when a new bar prints. One entry per instrument.
+        self._sr_cache = {}
+
+    def _sr_levels(self, inst_key: str, highs_5m, lows_5m):
+        version = self.scanner.bar_version(inst_key)
+        cached = self._sr_cache.get(inst_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        levels = compute_sr_levels(highs_5m, lows_5m)
+        self._sr_cache[inst_key] = (version, levels)
+        return levels
+
+    def evaluate_batch(self, inst_keys, ltps):
+        """
+        Evaluate a whole tick batch. The data-sufficiency gate runs once as
+        an ndarray mask over every instrument; only the survivors go through
+        _evaluate(), which does not repeat the gate. Returns (position in inst_keys, decision) pairs for the
+        instruments that produced a decision, in input order.
+        """
+        if not len(inst_keys):
+            return []
+
+        survivors = np.flatnonzero(self.scanner.bar_counts(inst_keys) >= MIN_BARS)
+
+        results = []
+        for pos in survivors.tolist():
+            decision = self._evaluate(inst_keys[pos], float(ltps[pos]))
+            if decision:
+                results.append((pos, decision))
+        return results
+
     def evaluate(self, inst_key: str, ltp: float):
 
         # ==================================================
         # 1️⃣ DATA CHECK
         # ==================================================
 
-        if not self.scanner.has_enough_data(inst_key, min_bars=25):
+        if not self.scanner.has_enough_data(inst_key, min_bars=MIN_BARS):
             return None
 
-        prices = self.scanner.get_prices(inst_key)
-        highs = self.scanner.get_highs(inst_key)
-        lows = self.scanner.get_lows(inst_key)
-        closes = self.scanner.get_closes(inst_key)
-        volumes = self.scanner.get_volumes(inst_key)
+        return self._evaluate(inst_key, ltp)
 
-        if not (prices and highs and lows and closes and volumes):
-            return None
+    def _evaluate(self, inst_key: str, ltp: float):
+        """evaluate() after the data check; the caller guarantees MIN_BARS bars."""
+
+        # one BarPanel of float64 views onto the scanner's columnar buffer
+        # (no copies); everything downstream consumes these arrays directly.
+        # the MIN_BARS gate already guarantees they are non-empty.
+        panel_1m = self.scanner.panel(inst_key)
+        highs = panel_1m.h
+        lows = panel_1m.l
+        closes = panel_1m.c
+        volumes = panel_1m.v
+        prices = closes
 
         # ==================================================
-        # 2️⃣ MTF CONTEXT
+        # 2️⃣ MTF BUILDER STATE
         # ==================================================
 
+        # kept up to date on every call, even when a later gate rejects;
+        # a bar for the same minute replaces the builder's newest one
         last_bar = self.scanner.get_last_n_bars(inst_key, 1)
         if not last_bar:
             return None
 
         bar = last_bar[0]
-
         self.mtf_builder.update(
-            inst_key,
-            bar["time"],
-            bar["open"],
-            bar["high"],
-            bar["low"],
-            bar["close"],
-            bar["volume"]
+            inst_key, bar["time"], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]
         )
 
-        candle_5m = self.mtf_builder.get_latest_5m(inst_key)
-        candle_15m = self.mtf_builder.get_latest_15m(inst_key)
+        # ==================================================
+        # 3️⃣ MARKET REGIME (SOFT FILTER)
+        # ==================================================
 
-        hist_5m_small = self.mtf_builder.get_tf_history(inst_key, 5, 3)
-        hist_15m = self.mtf_builder.get_tf_history(inst_key, 15, 3)
+        regime = detect_market_regime(
+            highs=highs,
+            lows=lows,
+            closes=closes
+        )
+
+        # cheapest gate and the one that rejects most ticks, so it runs
+        # before the MTF / VWAP / HTF work
+        if regime.state in ("WEAK", "COMPRESSION"):
+            return None
+
+        # ==================================================
+        # 4️⃣ MTF CONTEXT
+        # ==================================================
+
+        bundle = self.mtf_builder.get_mtf_bundle(inst_key, (5, 15), 3)
+        candle_5m, hist_5m_small = bundle[5]
+        candle_15m, hist_15m = bundle[15]
 
         mtf_ctx = analyze_mtf(
             candle_5m,
@@ -72,32 +132,24 @@ class StrategyEngine:
             history_15m=hist_15m
         )
 
-        if mtf_ctx.direction == "NEUTRAL" or mtf_ctx.conflict:
+        if mtf_ctx.code == Direction.NEUTRAL or mtf_ctx.conflict:
             return None
 
         # ==================================================
-        # 3️⃣ VWAP CONTEXT
+        # 5️⃣ VWAP CONTEXT
         # ==================================================
 
-        if inst_key not in self.vwap_calculators:
-            self.vwap_calculators[inst_key] = VWAPCalculator()
-
-        vwap_calc = self.vwap_calculators[inst_key]
-
-        vwap_calc.update(
-            ltp,
-            volumes[-1] if volumes else 0
-        )
-
-        vwap_ctx = vwap_calc.get_context(ltp)
+        vwap_ctx = self.vwap_book.get_context(inst_key, ltp)
 
         # ==================================================
-        # 4️⃣ HTF BIAS (FINAL DIRECTION AUTHORITY)
+        # 6️⃣ HTF BIAS (FINAL DIRECTION AUTHORITY)
         # ==================================================
 
-        hist_5m = self.mtf_builder.get_tf_history(inst_key, minutes=5, lookback=120)
+        # 5m candles as one BarPanel: HTF bias reads its closes, SR its
+        # highs/lows, without per-candle dicts
+        hist_5m = self.mtf_builder.get_tf_panel(inst_key, minutes=5, lookback=120)
 
-        if not hist_5m or len(hist_5m) < 60:
+        if len(hist_5m) < 60:
             return None
 
         htf_bias = get_htf_bias(
@@ -106,44 +158,32 @@ class StrategyEngine:
         )
 
         # 🔥 FINAL DIRECTION CHECK (STRICT)
-        if mtf_ctx.direction != htf_bias.direction:
+        if mtf_ctx.code != htf_bias.code:
             return None
 
         direction = htf_bias.direction
 
         # ==================================================
-        # 5️⃣ MARKET REGIME (SOFT FILTER)
-        # ==================================================
-
-        regime = detect_market_regime(
-            highs=highs,
-            lows=lows,
-            closes=closes
-        )
-
-        if regime.state in ("WEAK", "COMPRESSION"):
-            return None
-
-        # ==================================================
-        # 6️⃣ PULLBACK SETUP
+        # 7️⃣ PULLBACK SETUP
         # ==================================================
 
-        highs_5m = [c["high"] for c in hist_5m]
-        lows_5m = [c["low"] for c in hist_5m]
+        highs_5m = hist_5m.h.tolist()
+        lows_5m = hist_5m.l.tolist()
 
         pullback = detect_pullback_signal(
             prices=prices,
             highs=highs_5m,
             lows=lows_5m,
             closes=closes,
-            htf_direction=direction
+            htf_direction=direction,
+            sr_levels=self._sr_levels(inst_key, highs_5m, lows_5m)
         )
 
         if not pullback:
             return None
 
         # ==================================================
-        # 7️⃣ FINAL DECISION
+        # 8️⃣ FINAL DECISION
         # ==================================================
 
         decision = final_trade_decision(
@@ -154,9 +194,14 @@ class StrategyEngine:
             closes=closes,
             volumes=volumes,
             market_regime=regime.state,
-            htf_bias_direction=direction,
+            htf_bias=htf_bias.code,
             vwap_ctx=vwap_ctx,
-            pullback_signal=pullback
+            pullback_signal=pullback,
+            atr=self.scanner.atr(inst_key),
+            range_high=self.scanner.range_high(inst_key),
+            range_low=self.scanner.range_low(inst_key),
+            recent_high=self.scanner.recent_high(inst_key, PULLBACK_LOOKBACK),
+            recent_low=self.scanner.recent_low(inst_key, PULLBACK_LOOKBACK)
         )
 
         # Debug info (optional)
@@ -1,45 +1,84 @@
 # strategy/volatility_context.py
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, Sequence
+
+import numpy as np
+
+from strategy._njit import njit, HAVE_NUMBA
 
 
 # =========================
 # ATR CALCULATIONS
 # =========================
 
-def compute_true_range(highs: List[float], lows: List[float], closes: List[float]) -> List[float]:
+def compute_true_range(highs: Sequence[float], lows: Sequence[float], closes: Sequence[float]) -> np.ndarray:
     if len(highs) < 2:
-        return []
-    tr = []
-    for i in range(1, len(highs)):
-        tr.append(
-            max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i - 1]),
-                abs(lows[i] - closes[i - 1])
-            )
-        )
+        return np.empty(0, dtype=np.float64)
+    h = np.asarray(highs, dtype=np.float64)
+    l = np.asarray(lows, dtype=np.float64)
+    c = np.asarray(closes, dtype=np.float64)
+    prev_close = c[:-1]
+    return np.maximum.reduce([
+        h[1:] - l[1:],
+        np.abs(h[1:] - prev_close),
+        np.abs(l[1:] - prev_close)
+    ])
+
+
+@njit(cache=True, nogil=True)
+def _bar_tr(h, l, c, i):
+    """True range of bar i (i >= 1) of float64 arrays."""
+    prev_close = c[i - 1]
+    tr = h[i] - l[i]
+    a = abs(h[i] - prev_close)
+    b = abs(l[i] - prev_close)
+    if a > tr:
+        tr = a
+    if b > tr:
+        tr = b
     return tr
 
 
+@njit(cache=True, nogil=True)
+def _tr_sum(h, l, c):
+    """Sequential sum of TR over bars 1..n-1 (float64 arrays), one loop."""
+    total = 0.0
+    for i in range(1, h.shape[0]):
+        total += _bar_tr(h, l, c, i)
+    return total
+
+
 def compute_atr(
-    highs: List[float],
-    lows: List[float],
-    closes: List[float],
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
     period: int = 14
 ) -> Optional[float]:
-    tr = compute_true_range(highs, lows, closes)
-    if len(tr) < period:
+    # only the last `period` TRs are averaged, and those need just the
+    # last `period + 1` bars -- don't build TR for the whole history
+    tail = period + 1
+    if len(highs) < tail:
         return None
-    return sum(tr[-period:]) / period
+    if HAVE_NUMBA:
+        # compiled TR + sum in one pass; also a sequential left-to-right
+        # sum, so the result matches the NumPy path exactly (no fastmath)
+        return _tr_sum(
+            np.ascontiguousarray(highs[-tail:], dtype=np.float64),
+            np.ascontiguousarray(lows[-tail:], dtype=np.float64),
+            np.ascontiguousarray(closes[-tail:], dtype=np.float64)
+        ) / period
+    tr = compute_true_range(highs[-tail:], lows[-tail:], closes[-tail:])
+    # sequential sum, same as MarketScanner.atr
+    return sum(tr.tolist()) / period
 
 
 # =========================
 # OUTPUT
 # =========================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VolatilityContext:
     state: str          # LOW | NORMAL | EXPANDING | HIGH
     score: float        # -1 to +1
@@ -52,6 +91,31 @@ class VolatilityContext:
 # SIMPLIFIED VOLATILITY LOGIC
 # =========================
 
+# move / ATR cut points; bisect index picks the row of _VOLATILITY_LEVELS
+#   < 0.5 LOW (very small penalty only), < 1.2 NORMAL (acceptable),
+#   < 1.8 EXPANDING (best zone), else HIGH / spike (small caution, not blocking)
+_VOLATILITY_THRESHOLDS = (0.5, 1.2, 1.8)
+_VOLATILITY_LEVELS = (
+    ("LOW", -0.3, "low_volatility"),
+    ("NORMAL", 0.3, "normal_volatility"),
+    ("EXPANDING", 0.8, "expansion"),
+    ("HIGH", -0.2, "high_volatility"),
+)
+
+
+# result when there is no usable ATR yet
+_VOLATILITY_UNKNOWN = VolatilityContext("UNKNOWN", 0.0, 0.0, 0.0, "no_atr")
+
+
+def volatility_level(move_pct_atr: float) -> int:
+    """Row of _VOLATILITY_LEVELS for a move / ATR ratio."""
+    return bisect_right(_VOLATILITY_THRESHOLDS, move_pct_atr)
+
+
+def volatility_score(move_pct_atr: float) -> float:
+    return _VOLATILITY_LEVELS[volatility_level(move_pct_atr)][1]
+
+
 def analyze_volatility(
     current_move: float,
     atr_value: Optional[float],
@@ -65,55 +129,17 @@ def analyze_volatility(
     """
 
     if atr_value is None or atr_value <= 0:
-        return VolatilityContext("UNKNOWN", 0.0, 0.0, 0.0, "no_atr")
+        return _VOLATILITY_UNKNOWN
 
     move_pct_atr = abs(current_move) / atr_value
+    state, score, comment = _VOLATILITY_LEVELS[volatility_level(move_pct_atr)]
 
-    # ----------------------
-    # LOW VOLATILITY
-    # ----------------------
-    if move_pct_atr < 0.5:
-        return VolatilityContext(
-            state="LOW",
-            score=-0.3,   # very small penalty only
-            atr=round(atr_value, 6),
-            move_pct_atr=round(move_pct_atr, 2),
-            comment="low_volatility"
-        )
-
-    # ----------------------
-    # NORMAL (ACCEPTABLE)
-    # ----------------------
-    if move_pct_atr < 1.2:
-        return VolatilityContext(
-            state="NORMAL",
-            score=0.3,
-            atr=round(atr_value, 6),
-            move_pct_atr=round(move_pct_atr, 2),
-            comment="normal_volatility"
-        )
-
-    # ----------------------
-    # EXPANSION (BEST ZONE)
-    # ----------------------
-    if move_pct_atr < 1.8:
-        return VolatilityContext(
-            state="EXPANDING",
-            score=0.8,
-            atr=round(atr_value, 6),
-            move_pct_atr=round(move_pct_atr, 2),
-            comment="expansion"
-        )
-
-    # ----------------------
-    # HIGH / SPIKE
-    # ----------------------
     return VolatilityContext(
-        state="HIGH",
-        score=-0.2,   # small caution only (not blocking)
-        atr=round(atr_value, 6),
-        move_pct_atr=round(move_pct_atr, 2),
-        comment="high_volatility"
+        state=state,
+        score=score,
+        atr=atr_value,
+        move_pct_atr=move_pct_atr,
+        comment=comment
     )
 
 
@@ -1,10 +1,13 @@
 # strategy/volume_context.py
 
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Optional, Sequence
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class VolumeContext:
     score: float          # -1 to +1 (controlled impact)
     strength: str         # HIGH | NORMAL | LOW
@@ -12,77 +15,98 @@ class VolumeContext:
     comment: str
 
 
+# returned whenever the history is shorter than `lookback`
+_VOLUME_INSUFFICIENT = VolumeContext(0.0, "LOW", "FLAT", "insufficient_data")
+
+
+# relative volume (current / average) cut points; bisect index picks the
+# row of _VOLUME_LEVELS: < 1.0 LOW (very small penalty only), < 1.5 NORMAL,
+# else HIGH
+_VOLUME_THRESHOLDS = (1.0, 1.5)
+_VOLUME_LEVELS = (
+    ("LOW", -0.2),
+    ("NORMAL", 0.5),
+    ("HIGH", 1.0),
+)
+_TREND_SCORE = {"RISING": 0.2, "FALLING": -0.2, "FLAT": 0.0}
+
+
+def _volume_profile(volumes: np.ndarray, lookback: int, rising_bars: int):
+    """
+    (strength, trend, unclamped score) for a float64 volume array with at
+    least `lookback` values. Shared by analyze_volume and volume_score.
+    """
+    avg_volume = float(volumes[-lookback:].mean())
+    rel = float(volumes[-1]) / avg_volume if avg_volume > 0 else 1.0
+    strength, score = _VOLUME_LEVELS[bisect_right(_VOLUME_THRESHOLDS, rel)]
+
+    trend = "FLAT"
+    if len(volumes) >= rising_bars:
+        step = np.diff(volumes[-rising_bars:])
+        if (step > 0).all():
+            trend = "RISING"
+        elif (step < 0).all():
+            trend = "FALLING"
+
+    return strength, trend, score + _TREND_SCORE[trend]
+
+
+def _clamp_score(score: float) -> float:
+    return round(max(min(score, 1.0), -1.0), 2)
+
+
+def volume_score(
+    volume_history: Sequence[float],
+    lookback: int = 20,
+    rising_bars: int = 3
+) -> float:
+    """analyze_volume(...).score without building the context."""
+    if volume_history is None or len(volume_history) < lookback:
+        return _VOLUME_INSUFFICIENT.score
+    volumes = np.asarray(volume_history, dtype=np.float64)
+    return _clamp_score(_volume_profile(volumes, lookback, rising_bars)[2])
+
+
 def analyze_volume(
-    volume_history: List[float],
-    close_prices: Optional[List[float]] = None,
+    volume_history: Sequence[float],
+    close_prices: Optional[Sequence[float]] = None,
     lookback: int = 20,
     rising_bars: int = 3
 ) -> VolumeContext:
     """
     SIMPLIFIED VOLUME LOGIC
 
+    volume_history / close_prices: lists or float64 arrays (oldest -> newest).
+
     Purpose:
     - Confirm participation
     - Avoid over-penalizing trades
     """
 
-    if not volume_history or len(volume_history) < lookback:
-        return VolumeContext(0.0, "LOW", "FLAT", "insufficient_data")
-
-    recent = volume_history[-lookback:]
-    avg_volume = sum(recent) / lookback
-    current_volume = volume_history[-1]
-
-    # ----------------------
-    # 1️⃣ Relative Volume
-    # ----------------------
-    rel = current_volume / avg_volume if avg_volume > 0 else 1.0
-
-    if rel >= 1.5:
-        strength = "HIGH"
-        score = 1.0
-    elif rel >= 1.0:
-        strength = "NORMAL"
-        score = 0.5
-    else:
-        strength = "LOW"
-        score = -0.2   # very small penalty only
+    if volume_history is None or len(volume_history) < lookback:
+        return _VOLUME_INSUFFICIENT
 
     # ----------------------
-    # 2️⃣ Volume Trend
+    # 1️⃣ Relative Volume / 2️⃣ Volume Trend
     # ----------------------
-    trend = "FLAT"
-
-    if len(volume_history) >= rising_bars:
-        last_n = volume_history[-rising_bars:]
-
-        if all(last_n[i] > last_n[i - 1] for i in range(1, len(last_n))):
-            trend = "RISING"
-            score += 0.2
-        elif all(last_n[i] < last_n[i - 1] for i in range(1, len(last_n))):
-            trend = "FALLING"
-            score -= 0.2
+    volumes = np.asarray(volume_history, dtype=np.float64)
+    strength, trend, score = _volume_profile(volumes, lookback, rising_bars)
 
     # ----------------------
     # 3️⃣ Price Confirmation (LIGHT)
     # ----------------------
     comment = "volume_only"
 
-    if close_prices and len(close_prices) >= 3:
-        move = close_prices[-1] - close_prices[-3]
+    if close_prices is not None and len(close_prices) >= 3:
+        move = float(close_prices[-1] - close_prices[-3])
 
         if abs(move) > 0.002 * close_prices[-1]:
             comment = "volume_supports_move"
         else:
             comment = "low_price_response"
 
-    # ----------------------
-    # Clamp score
-    # ----------------------
-    score = max(min(score, 1.0), -1.0)
-
     return VolumeContext(
-        score=round(score, 2),
+        score=_clamp_score(score),
         strength=strength,
         trend=trend,
         comment=comment
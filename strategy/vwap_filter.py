@@ -2,14 +2,16 @@
 
 from collections import deque
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Sequence
+
+import numpy as np
 
 
 # =========================
 # VWAP Context Output
 # =========================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VWAPContext:
     vwap: Optional[float]
     distance_pct: float        # price minus VWAP (%)
@@ -31,23 +33,28 @@ class VWAPCalculator:
     - Avoid overfitting (no slope, no noise)
     """
 
+    __slots__ = ("window", "price_volume_sum", "volume_sum",
+                 "price_volume_deque", "volume_deque", "_evictions")
+
     def __init__(self, window: Optional[int] = None):
         self.window = window
 
         self.price_volume_sum = 0.0
         self.volume_sum = 0.0
 
-        if window:
-            self.price_volume_deque = deque(maxlen=window)
-            self.volume_deque = deque(maxlen=window)
+        # deques exist only for a rolling window; None means session VWAP
+        self.price_volume_deque = deque(maxlen=window) if window else None
+        self.volume_deque = deque(maxlen=window) if window else None
 
         self.reset()
 
     def reset(self):
         self.price_volume_sum = 0.0
         self.volume_sum = 0.0
+        # evictions since the rolling sums were last recomputed exactly
+        self._evictions = 0
 
-        if hasattr(self, "price_volume_deque"):
+        if self.price_volume_deque is not None:
             self.price_volume_deque.clear()
             self.volume_deque.clear()
 
@@ -55,11 +62,24 @@ class VWAPCalculator:
         if price is None or volume is None or volume <= 0:
             return None
 
-        if self.window:
-            self.price_volume_deque.append(price * volume)
+        if self.price_volume_deque is not None:
+            pv = price * volume
+            # rolling sums: add the new value, drop the one the deque evicts
+            if len(self.volume_deque) == self.window:
+                self.price_volume_sum -= self.price_volume_deque[0]
+                self.volume_sum -= self.volume_deque[0]
+                self._evictions += 1
+            self.price_volume_deque.append(pv)
             self.volume_deque.append(volume)
-            self.price_volume_sum = sum(self.price_volume_deque)
-            self.volume_sum = sum(self.volume_deque)
+            if self._evictions >= self.window:
+                # resync once per window so add/subtract rounding can't drift
+                # (O(1) amortised)
+                self._evictions = 0
+                self.price_volume_sum = sum(self.price_volume_deque)
+                self.volume_sum = sum(self.volume_deque)
+            else:
+                self.price_volume_sum += pv
+                self.volume_sum += volume
         else:
             self.price_volume_sum += price * volume
             self.volume_sum += volume
@@ -74,44 +94,110 @@ class VWAPCalculator:
             return None
         return self.price_volume_sum / self.volume_sum
 
-    # =========================
-    # VWAP CONTEXT (SIMPLIFIED)
-    # =========================
-
     def get_context(self, price: float) -> VWAPContext:
-        vwap = self.get_vwap()
-
-        if vwap is None or price is None:
-            return VWAPContext(
-                vwap=None,
-                distance_pct=0.0,
-                acceptance="NEAR",
-                score=0.0,
-                comment="VWAP unavailable"
-            )
-
-        distance_pct = (price - vwap) / vwap * 100.0
-
-        # ----------------------
-        # Acceptance Zones
-        # ----------------------
-        if distance_pct > 0.2:
-            acceptance = "ABOVE"
-            score = 1.0
-            comment = "above_vwap"
-        elif distance_pct < -0.2:
-            acceptance = "BELOW"
-            score = -1.0
-            comment = "below_vwap"
-        else:
-            acceptance = "NEAR"
-            score = 0.0
-            comment = "near_vwap"
-
-        return VWAPContext(
-            vwap=round(vwap, 6),
-            distance_pct=round(distance_pct, 3),
-            acceptance=acceptance,
-            score=score,
-            comment=comment
-        )
+        return _vwap_context(self.get_vwap(), price)
+
+
+# =========================
+# VWAP CONTEXT (SIMPLIFIED)
+# =========================
+
+# one shared instance for the no-VWAP path (common at session start);
+# VWAPContext is frozen, so callers cannot alter it
+_VWAP_UNAVAILABLE = VWAPContext(
+    vwap=None,
+    distance_pct=0.0,
+    acceptance="NEAR",
+    score=0.0,
+    comment="VWAP unavailable"
+)
+
+
+def _vwap_context(vwap: Optional[float], price: float) -> VWAPContext:
+    if vwap is None or price is None:
+        return _VWAP_UNAVAILABLE
+
+    distance_pct = (price - vwap) / vwap * 100.0
+
+    # ----------------------
+    # Acceptance Zones
+    # ----------------------
+    if distance_pct > 0.2:
+        acceptance = "ABOVE"
+        score = 1.0
+        comment = "above_vwap"
+    elif distance_pct < -0.2:
+        acceptance = "BELOW"
+        score = -1.0
+        comment = "below_vwap"
+    else:
+        acceptance = "NEAR"
+        score = 0.0
+        comment = "near_vwap"
+
+    return VWAPContext(
+        vwap=vwap,
+        distance_pct=distance_pct,
+        acceptance=acceptance,
+        score=score,
+        comment=comment
+    )
+
+
+# =========================
+# VWAP Book (whole universe, SoA)
+# =========================
+
+class VWAPBook:
+    """
+    Session VWAP for a fixed instrument universe, stored column-wise.
+
+    Row i of cum_pv / cum_v / vwap belongs to inst_keys[i], so a batch of
+    ticks updates with a few vector ops instead of one object per instrument.
+    Same semantics as VWAPCalculator(window=None): ticks with volume <= 0
+    are ignored.
+    """
+
+    def __init__(self, inst_keys: Sequence[str]):
+        self.index: Dict[str, int] = {k: i for i, k in enumerate(inst_keys)}
+        n = len(self.index)
+        self.cum_pv = np.zeros(n, dtype=np.float64)
+        self.cum_v = np.zeros(n, dtype=np.float64)
+        self.vwap = np.full(n, np.nan, dtype=np.float64)
+
+    def reset(self):
+        self.cum_pv[:] = 0.0
+        self.cum_v[:] = 0.0
+        self.vwap[:] = np.nan
+
+    def update_many(self, idx: np.ndarray, prices: np.ndarray, volumes: np.ndarray):
+        """
+        idx: unique row indices; prices / volumes: values aligned with idx.
+        """
+        ok = volumes > 0
+        if not ok.all():
+            idx, prices, volumes = idx[ok], prices[ok], volumes[ok]
+        if not len(idx):
+            return
+
+        self.cum_pv[idx] += prices * volumes
+        self.cum_v[idx] += volumes
+        self.vwap[idx] = self.cum_pv[idx] / self.cum_v[idx]
+
+    def update(self, inst_key: str, price: float, volume: float) -> Optional[float]:
+        i = self.index.get(inst_key)
+        if i is None or price is None or volume is None or volume <= 0:
+            return None
+        self.cum_pv[i] += price * volume
+        self.cum_v[i] += volume
+        self.vwap[i] = self.cum_pv[i] / self.cum_v[i]
+        return float(self.vwap[i])
+
+    def get_vwap(self, inst_key: str) -> Optional[float]:
+        i = self.index.get(inst_key)
+        if i is None or self.cum_v[i] <= 0:
+            return None
+        return float(self.vwap[i])
+
+    def get_context(self, inst_key: str, price: float) -> VWAPContext:
+        return _vwap_context(self.get_vwap(inst_key), price)